@@ -0,0 +1,56 @@
+"""
+Alembic environment
+
+Migrations run on the application's synchronous engine, so they use the
+same DATABASE_URL (environment or .env) as the API. SQLite gets batch
+mode, which rebuilds tables for ALTERs it does not support natively.
+"""
+from logging.config import fileConfig
+from alembic import context
+from src.database import Base, DATABASE_URL, engine
+from src import models  # noqa: F401  (registers every table on Base.metadata)
+
+config = context.config
+
+# Skipped when run from the application, which configures its own logging
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Leave the search index (raw DDL in revision 0003, FTS5 shadow tables on SQLite) alone"""
+    table_name = name if type_ == "table" else getattr(getattr(obj, "table", None), "name", "")
+    return not (table_name or "").startswith("ticket_search")
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout instead of running it (alembic upgrade head --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,295 @@
+"""
+Baseline: the schema previously created by Base.metadata.create_all
+
+Fresh databases get every table. Databases created by init_db() before
+migrations existed are adopted in place: missing tables are created,
+columns added since (tickets.updated_at, users.wilayah_key) are added and
+backfilled, and the legacy JSON skill/permission columns on users are
+copied into their junction tables and dropped.
+
+The search index (ticket_search) and the technician statistics backfill
+come in revision 0003.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum columns store member names
+USER_ROLES = ("EMPLOYEE", "TECHNICIAN", "ADMIN")
+TICKET_STATUSES = ("PENDING", "IN_PROGRESS", "COMPLETED")
+TICKET_CATEGORIES = ("HARDWARE", "JARINGAN_KONEKSI", "ZOOM", "AKUN", "APLIKASI")
+NOTIFICATION_TYPES = ("TICKET_ASSIGNED", "TICKET_ACCEPTED", "TICKET_COMPLETED", "NEW_COMMENT")
+
+# Legacy JSON array columns on users -> (junction table, value column)
+LEGACY_LIST_COLUMNS = {
+    "categories": ("technician_categories", "category"),
+    "sub_categories": ("technician_sub_categories", "sub_category"),
+    "permissions": ("admin_permissions", "permission"),
+}
+
+
+def _existing_enum(name: str, values: tuple):
+    """Enum whose PostgreSQL type an earlier table already created"""
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def _normalize_region(value):
+    """Frozen copy of src.utils.regions.normalize_region as of this revision"""
+    if not value:
+        return None
+    key = value.lower().replace(" ", "").replace("_", "")
+    if key == "alluit":
+        return None
+    if key.startswith("kantorinduk"):
+        return "kantorinduk"
+    return key.removeprefix("upt")
+
+
+def _parse_list(raw):
+    try:
+        values = json.loads(raw) if raw else []
+    except ValueError:
+        return []
+    return sorted({str(value) for value in values}) if isinstance(values, list) else []
+
+
+def _create_users():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("nama", sa.String(), nullable=False),
+        sa.Column("role", sa.Enum(*USER_ROLES, name="userrole"), nullable=False),
+        sa.Column("nip", sa.String(), nullable=True),
+        sa.Column("region", sa.String(), nullable=True),
+        sa.Column("wilayah", sa.String(), nullable=True),
+        sa.Column("wilayah_key", sa.String(), nullable=True),
+        sa.Column("assigned_tickets_count", sa.Integer(), nullable=True),
+        sa.Column("completed_tickets_count", sa.Integer(), nullable=True),
+        sa.Column("nomor_wa", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_available", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_role", "users", ["role"])
+    op.create_index("ix_users_nip", "users", ["nip"], unique=True)
+    op.create_index("ix_users_wilayah_key", "users", ["wilayah_key"])
+
+
+def _create_link_tables(existing: set):
+    if "technician_categories" not in existing:
+        op.create_table(
+            "technician_categories",
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("category", sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("user_id", "category"),
+        )
+        op.create_index("ix_technician_categories_category", "technician_categories", ["category", "user_id"])
+    if "technician_sub_categories" not in existing:
+        op.create_table(
+            "technician_sub_categories",
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("sub_category", sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("user_id", "sub_category"),
+        )
+        op.create_index(
+            "ix_technician_sub_categories_sub_category", "technician_sub_categories", ["sub_category", "user_id"]
+        )
+    if "admin_permissions" not in existing:
+        op.create_table(
+            "admin_permissions",
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("permission", sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("user_id", "permission"),
+        )
+
+
+def _adopt_legacy_users(bind):
+    """Bring a users table from before the junction tables up to date"""
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("users")}
+
+    if "wilayah_key" not in columns:
+        op.add_column("users", sa.Column("wilayah_key", sa.String(), nullable=True))
+        op.create_index("ix_users_wilayah_key", "users", ["wilayah_key"])
+    rows = bind.execute(sa.text("SELECT id, wilayah FROM users WHERE wilayah IS NOT NULL")).all()
+    for user_id, wilayah in rows:
+        bind.execute(
+            sa.text("UPDATE users SET wilayah_key = :key WHERE id = :id"),
+            {"key": _normalize_region(wilayah), "id": user_id}
+        )
+
+    legacy = [column for column in LEGACY_LIST_COLUMNS if column in columns]
+    for column in legacy:
+        table, value_column = LEGACY_LIST_COLUMNS[column]
+        rows = bind.execute(sa.text(f"SELECT id, {column} FROM users WHERE {column} IS NOT NULL")).all()
+        links = [
+            {"user_id": user_id, "value": value}
+            for user_id, raw in rows
+            for value in _parse_list(raw)
+        ]
+        for user_id in {link["user_id"] for link in links}:
+            bind.execute(sa.text(f"DELETE FROM {table} WHERE user_id = :user_id"), {"user_id": user_id})
+        if links:
+            bind.execute(
+                sa.text(f"INSERT INTO {table} (user_id, {value_column}) VALUES (:user_id, :value)"),
+                links
+            )
+    if legacy:
+        with op.batch_alter_table("users") as batch:
+            for column in legacy:
+                batch.drop_column(column)
+
+
+def _create_tickets():
+    op.create_table(
+        "tickets",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("employee_id", sa.String(), nullable=False),
+        sa.Column("technician_id", sa.String(), nullable=True),
+        sa.Column("deskripsi", sa.Text(), nullable=False),
+        sa.Column("kategori", sa.Enum(*TICKET_CATEGORIES, name="ticketcategory"), nullable=False),
+        sa.Column("sub_kategori", sa.String(), nullable=True),
+        sa.Column("status", sa.Enum(*TICKET_STATUSES, name="ticketstatus"), nullable=False),
+        sa.Column("resolution_notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("accepted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["employee_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["technician_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tickets_id", "tickets", ["id"])
+    op.create_index("ix_tickets_employee_id", "tickets", ["employee_id"])
+    op.create_index("ix_tickets_technician_id", "tickets", ["technician_id"])
+    op.create_index("ix_tickets_kategori", "tickets", ["kategori"])
+    op.create_index("ix_tickets_status", "tickets", ["status"])
+    op.create_index("ix_tickets_created_at", "tickets", ["created_at"])
+
+
+def _create_comments():
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("ticket_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["ticket_id"], ["tickets.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_comments_id", "comments", ["id"])
+    op.create_index("ix_comments_ticket_id", "comments", ["ticket_id"])
+    op.create_index("ix_comments_user_id", "comments", ["user_id"])
+    op.create_index("ix_comments_created_at", "comments", ["created_at"])
+
+
+def _create_notifications():
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("ticket_id", sa.String(), nullable=False),
+        sa.Column("type", sa.Enum(*NOTIFICATION_TYPES, name="notificationtype"), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("read_status", sa.Boolean(), nullable=True),
+        sa.Column("extra_data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["ticket_id"], ["tickets.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_notifications_id", "notifications", ["id"])
+    op.create_index("ix_notifications_user_id", "notifications", ["user_id"])
+    op.create_index("ix_notifications_ticket_id", "notifications", ["ticket_id"])
+    op.create_index("ix_notifications_read_status", "notifications", ["read_status"])
+    op.create_index("ix_notifications_created_at", "notifications", ["created_at"])
+
+
+def _create_notification_counters(backfill: bool):
+    op.create_table(
+        "notification_counters",
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    if backfill:
+        op.execute(
+            "INSERT INTO notification_counters (user_id, unread_count) "
+            "SELECT user_id, count(*) FROM notifications WHERE read_status = false GROUP BY user_id"
+        )
+
+
+def _create_technician_daily_stats():
+    op.create_table(
+        "technician_daily_stats",
+        sa.Column("technician_id", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("kategori", _existing_enum("ticketcategory", TICKET_CATEGORIES), nullable=False),
+        sa.Column("accepted_count", sa.Integer(), nullable=False),
+        sa.Column("response_seconds_sum", sa.Float(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+        sa.Column("resolution_seconds_sum", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["technician_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("technician_id", "day", "kategori"),
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing = set(sa.inspect(bind).get_table_names())
+
+    if "users" not in existing:
+        _create_users()
+    _create_link_tables(existing)
+    if "users" in existing:
+        _adopt_legacy_users(bind)
+
+    if "tickets" not in existing:
+        _create_tickets()
+    elif "updated_at" not in {column["name"] for column in sa.inspect(bind).get_columns("tickets")}:
+        op.add_column("tickets", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+        op.execute("UPDATE tickets SET updated_at = COALESCE(completed_at, accepted_at, created_at)")
+
+    if "comments" not in existing:
+        _create_comments()
+    if "notifications" not in existing:
+        _create_notifications()
+    if "notification_counters" not in existing:
+        _create_notification_counters(backfill="notifications" in existing)
+    if "technician_daily_stats" not in existing:
+        _create_technician_daily_stats()
+
+
+def downgrade():
+    for table in (
+        "technician_daily_stats", "notification_counters", "notifications", "comments", "tickets",
+        "admin_permissions", "technician_sub_categories", "technician_categories", "users",
+    ):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        for enum_name in ("notificationtype", "ticketstatus", "ticketcategory", "userrole"):
+            op.execute(f"DROP TYPE IF EXISTS {enum_name}")
@@ -0,0 +1,163 @@
+"""
+Search index and technician statistics backfill
+
+Both used to run on every API worker start; as a migration they run once
+per deploy, so workers starting together never race on the DDL or insert
+the same rollup keys.
+
+- ticket_search: the tsvector table and GIN index on PostgreSQL, an FTS5
+  virtual table on SQLite, filled from existing tickets when newly
+  created; other databases search with ILIKE and get no table
+- technician_daily_stats: filled from ticket history when empty
+
+Both steps are no-ops on databases that already have them. The DDL and
+the backfill are frozen copies of services/search.py and
+services/stats.py as of this revision, so later changes there do not
+change what this revision does.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from collections import defaultdict
+from datetime import timezone
+from alembic import op
+import sqlalchemy as sa
+from src.config import get_settings
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+POSTGRESQL_SEARCH_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS ticket_search (
+        ticket_id VARCHAR PRIMARY KEY REFERENCES tickets(id) ON DELETE CASCADE,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_ticket_search_document ON ticket_search USING GIN (document)",
+]
+
+POSTGRESQL_SEARCH_FILL = """
+    INSERT INTO ticket_search (ticket_id, document)
+    SELECT t.id,
+           setweight(to_tsvector(CAST(:search_config AS regconfig), t.deskripsi), 'A')
+           || setweight(to_tsvector(CAST(:search_config AS regconfig), coalesce(t.resolution_notes, '')), 'B')
+           || setweight(to_tsvector(CAST(:search_config AS regconfig), coalesce(
+                (SELECT string_agg(c.text, ' ') FROM comments c WHERE c.ticket_id = t.id), ''
+              )), 'C')
+    FROM tickets t
+    WHERE true
+    ON CONFLICT (ticket_id) DO UPDATE SET document = EXCLUDED.document
+"""
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search USING fts5(
+        ticket_id UNINDEXED, deskripsi, resolution_notes, comments,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+SQLITE_SEARCH_FILL = """
+    INSERT INTO ticket_search (ticket_id, deskripsi, resolution_notes, comments)
+    SELECT t.id, t.deskripsi, coalesce(t.resolution_notes, ''),
+           coalesce((SELECT group_concat(c.text, ' ') FROM comments c WHERE c.ticket_id = t.id), '')
+    FROM tickets t
+"""
+
+tickets = sa.table(
+    "tickets",
+    sa.column("technician_id", sa.String),
+    sa.column("kategori", sa.String),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+    sa.column("accepted_at", sa.DateTime(timezone=True)),
+    sa.column("completed_at", sa.DateTime(timezone=True)),
+)
+
+technician_daily_stats = sa.table(
+    "technician_daily_stats",
+    sa.column("technician_id", sa.String),
+    sa.column("day", sa.Date),
+    sa.column("kategori", sa.String),
+    sa.column("accepted_count", sa.Integer),
+    sa.column("response_seconds_sum", sa.Float),
+    sa.column("completed_count", sa.Integer),
+    sa.column("resolution_seconds_sum", sa.Float),
+)
+
+
+def _as_utc(value):
+    """Frozen copy of src.services.stats._as_utc as of this revision"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _seconds_between(start, end) -> float:
+    """Frozen copy of src.services.stats.seconds_between as of this revision"""
+    if start is None or end is None:
+        return 0.0
+    return max(0.0, (_as_utc(end) - _as_utc(start)).total_seconds())
+
+
+def _create_search_index(bind):
+    if bind.dialect.name == "postgresql":
+        ddl, fill = POSTGRESQL_SEARCH_DDL, POSTGRESQL_SEARCH_FILL
+    elif bind.dialect.name == "sqlite":
+        ddl, fill = SQLITE_SEARCH_DDL, SQLITE_SEARCH_FILL
+    else:
+        return
+    created = not sa.inspect(bind).has_table("ticket_search")
+    for statement in ddl:
+        bind.execute(sa.text(statement))
+    if created:
+        params = {"search_config": get_settings().search_language} if bind.dialect.name == "postgresql" else {}
+        bind.execute(sa.text(fill), params)
+
+
+def _backfill_technician_stats(bind):
+    if bind.scalar(sa.select(technician_daily_stats.c.technician_id).limit(1)) is not None:
+        return
+
+    totals = defaultdict(lambda: defaultdict(float))
+    rows = bind.execute(
+        sa.select(
+            tickets.c.technician_id, tickets.c.kategori,
+            tickets.c.created_at, tickets.c.accepted_at, tickets.c.completed_at
+        ).where(tickets.c.technician_id.is_not(None), tickets.c.accepted_at.is_not(None))
+    )
+    for row in rows:
+        accepted = totals[(row.technician_id, _as_utc(row.accepted_at).date(), row.kategori)]
+        accepted["accepted_count"] += 1
+        accepted["response_seconds_sum"] += _seconds_between(row.created_at, row.accepted_at)
+        if row.completed_at is not None:
+            completed = totals[(row.technician_id, _as_utc(row.completed_at).date(), row.kategori)]
+            completed["completed_count"] += 1
+            completed["resolution_seconds_sum"] += _seconds_between(row.accepted_at, row.completed_at)
+
+    if totals:
+        bind.execute(sa.insert(technician_daily_stats), [
+            {
+                "technician_id": technician_id,
+                "day": day,
+                "kategori": kategori,
+                "accepted_count": int(values["accepted_count"]),
+                "response_seconds_sum": values["response_seconds_sum"],
+                "completed_count": int(values["completed_count"]),
+                "resolution_seconds_sum": values["resolution_seconds_sum"],
+            }
+            for (technician_id, day, kategori), values in totals.items()
+        ])
+
+
+def upgrade():
+    bind = op.get_bind()
+    _create_search_index(bind)
+    _backfill_technician_stats(bind)
+
+
+def downgrade():
+    # The rollup keeps its rows: backfilled and incrementally added ones are indistinguishable
+    op.execute("DROP TABLE IF EXISTS ticket_search")
@@ -0,0 +1,52 @@
+"""
+Sort-order indexes for the unfiltered technician list and inbox
+
+The 0002 indexes on tickets (technician_id, status, ...) and
+notifications (user_id, read_status, ...) only give rows in created_at
+order once the status column is fixed, so a technician's default list
+and the default inbox sorted every row of the user for each page.
+
+- tickets (technician_id, created_at DESC, id DESC): a technician's
+  list, newest first, including keyset pages
+- notifications (user_id, created_at DESC, id DESC): the inbox, newest
+  first, including keyset pages
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+NEW_INDEXES = [
+    ("ix_tickets_technician_created", "tickets",
+     ["technician_id", sa.text("created_at DESC"), sa.text("id DESC")]),
+    ("ix_notifications_user_created", "notifications",
+     ["user_id", sa.text("created_at DESC"), sa.text("id DESC")]),
+]
+
+
+def _concurrently() -> dict:
+    return {"postgresql_concurrently": True} if op.get_bind().dialect.name == "postgresql" else {}
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in NEW_INDEXES:
+            op.create_index(name, table, columns, **_concurrently())
+
+    if op.get_bind().dialect.name == "postgresql":
+        for table in ("tickets", "notifications"):
+            op.execute(f"ANALYZE {table}")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in NEW_INDEXES:
+            op.drop_index(name, table_name=table, **_concurrently())
@@ -0,0 +1,265 @@
+"""
+Endpoint latency benchmark
+
+Starts the API (src.main:app under uvicorn) against a database loaded by
+scripts/seed_data.py and drives the client flow with concurrent virtual
+users:
+
+    login -> list tickets -> open ticket -> read comments -> add comment
+          -> create ticket -> accept (technician) -> complete (technician)
+
+Throughput and p50/p95/p99 latency are recorded per route and per
+concurrency level and written as JSON; --compare checks a run against an
+earlier result and exits non-zero on a p99 regression.
+
+    python scripts/seed_data.py --reset --employees 2000 --technicians 40 --tickets 200000 --until 2025-01-01
+    python scripts/benchmark.py --concurrency 1 8 32 --duration 20
+    python scripts/benchmark.py --compare benchmarks/results/<commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+PASSWORD = "password"
+
+TECHNICIAN_USERNAMES: dict[str, str] = {}
+
+
+class Recorder:
+    """Latency samples per route template"""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[route].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    """Reduce samples to throughput and latency percentiles (milliseconds)"""
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        routes[route] = {
+            "count": len(ordered),
+            "errors": recorder.errors.get(route, 0),
+            "throughput_rps": round(len(ordered) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        }
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+async def login(client: httpx.AsyncClient, recorder: Recorder, username: str) -> dict:
+    response = await recorder.call(
+        client, "POST /api/auth/login", "POST", "/api/auth/login",
+        json={"username": username, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['data']['token']}"}
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, user_no: int, args, deadline: float) -> None:
+    """Run the client flow in a loop until the deadline"""
+    rng = random.Random(user_no)
+    employee = await login(client, recorder, f"pegawai{rng.randrange(args.employees):06d}")
+    technicians = (await recorder.call(
+        client, "GET /api/tickets/technicians", "GET", "/api/tickets/technicians",
+        params={"category": "hardware"}, headers=employee
+    )).json()
+    technician = rng.choice(technicians)
+    technician_auth = None
+
+    while time.monotonic() < deadline:
+        page = (await recorder.call(
+            client, "GET /api/tickets", "GET", "/api/tickets", params={"limit": 20}, headers=employee
+        )).json()
+        if page.get("tickets"):
+            ticket_id = rng.choice(page["tickets"])["id"]
+            await recorder.call(client, "GET /api/tickets/{id}", "GET", f"/api/tickets/{ticket_id}", headers=employee)
+            await recorder.call(
+                client, "GET /api/tickets/{id}/comments", "GET", f"/api/tickets/{ticket_id}/comments", headers=employee
+            )
+            await recorder.call(
+                client, "POST /api/tickets/{id}/comments", "POST", f"/api/tickets/{ticket_id}/comments",
+                json={"text": "Mohon info perkembangan tiket ini"}, headers=employee
+            )
+
+        created = await recorder.call(
+            client, "POST /api/tickets", "POST", "/api/tickets",
+            json={"deskripsi": "Printer tidak bisa mencetak (benchmark)", "kategori": "hardware",
+                  "technician_id": technician["id"]},
+            headers=employee
+        )
+        if created.status_code != 201:
+            continue
+        ticket_id = created.json()["id"]
+
+        if technician_auth is None:
+            # /technicians does not expose usernames
+            technician_auth = await login(client, recorder, TECHNICIAN_USERNAMES[technician["id"]])
+        await recorder.call(
+            client, "POST /api/tickets/{id}/accept", "POST", f"/api/tickets/{ticket_id}/accept", headers=technician_auth
+        )
+        await recorder.call(
+            client, "POST /api/tickets/{id}/complete", "POST", f"/api/tickets/{ticket_id}/complete",
+            json={"resolution_notes": "Sudah diperbaiki (benchmark)"}, headers=technician_auth
+        )
+
+
+def load_technician_usernames(database_url: str) -> None:
+    """Map technician IDs to usernames for logging in as the assigned technician"""
+    # Plain SQL so the app's configured engine (from .env) is never created here
+    engine = create_engine(database_url)
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT id, username FROM users WHERE role = 'TECHNICIAN'"))
+        TECHNICIAN_USERNAMES.update({row.id: row.username for row in rows})
+    engine.dispose()
+
+
+async def run_level(base_url: str, concurrency: int, args) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            virtual_user(client, recorder, concurrency * 1000 + user_no, args, deadline)
+            for user_no in range(concurrency)
+        ])
+        return summarize(recorder, time.monotonic() - started)
+
+
+def start_server(args) -> subprocess.Popen:
+    """Start uvicorn on the benchmark database and wait for /api/health"""
+    env = {**os.environ, "DATABASE_URL": args.database_url, "DEBUG": "false"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    for _ in range(120):
+        try:
+            if httpx.get(f"http://127.0.0.1:{args.port}/api/health", timeout=1).status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        if server.poll() is not None:
+            sys.exit("❌ Server exited during startup")
+        time.sleep(0.5)
+    server.terminate()
+    sys.exit("❌ Server did not become healthy")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Print p99 changes per route and level; return False on any regression"""
+    ok = True
+    for level, result in current["levels"].items():
+        baseline_routes = baseline.get("levels", {}).get(level, {}).get("routes", {})
+        for route, stats in result["routes"].items():
+            before = baseline_routes.get(route)
+            if not before or not before["p99_ms"]:
+                continue
+            change = stats["p99_ms"] / before["p99_ms"] - 1
+            marker = "❌" if change > threshold else "  "
+            ok = ok and change <= threshold
+            print(f"{marker} c={level:<4} {route:<36} p99 {before['p99_ms']:>8.1f} -> {stats['p99_ms']:>8.1f} ms ({change:+.0%})")
+    return ok
+
+
+async def main(args) -> int:
+    load_technician_usernames(args.database_url)
+
+    server = None if args.url else start_server(args)
+    base_url = args.url or f"http://127.0.0.1:{args.port}"
+    try:
+        levels = {}
+        for concurrency in args.concurrency:
+            print(f"Concurrency {concurrency} for {args.duration}s...")
+            levels[str(concurrency)] = await run_level(base_url, concurrency, args)
+            result = levels[str(concurrency)]
+            print(f"  {result['throughput_rps']} req/s over {result['requests']} requests")
+            for route, stats in result["routes"].items():
+                print(f"  {route:<36} n={stats['count']:<6} p50={stats['p50_ms']:>7.1f} "
+                      f"p95={stats['p95_ms']:>7.1f} p99={stats['p99_ms']:>7.1f} ms errors={stats['errors']}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "database": args.database_url.split("://")[0],
+        "workers": args.workers,
+        "duration_s": args.duration,
+        "levels": levels,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"✅ Results written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        print(f"\nComparing with {baseline.get('commit')} (p99 threshold {args.threshold:.0%}):")
+        if not compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API latency per route and concurrency level")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", "sqlite:///./benchmark.db"),
+                        help="Database loaded with scripts/seed_data.py (sync URL)")
+    parser.add_argument("--url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Virtual users per level")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per concurrency level")
+    parser.add_argument("--employees", type=int, default=2000, help="Generated employees to log in as")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare p99 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p99 increase before failing")
+    sys.exit(asyncio.run(main(parser.parse_args())))
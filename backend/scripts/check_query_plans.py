@@ -0,0 +1,151 @@
+"""
+Fail if a hot route query falls back to a sequential scan or a sort
+
+Runs EXPLAIN for the queries behind the ticket lists, the comment thread,
+the notification inbox and the assignment load sync against a database
+loaded with scripts/seed_data.py (the benchmark dataset). Parameters are
+the busiest employee, technician, ticket and notification owner, where a
+planner is most tempted to scan. Exits 1 if any plan reads tickets,
+comments or notifications in full: a sequential scan, or an index walked
+end to end without a search condition (e.g. only for its sort order). It
+also fails a plan that sorts their rows instead of reading them in index
+order, since then every keyset page sorts all of the user's rows.
+
+    python scripts/seed_data.py --reset --employees 2000 --technicians 40 --tickets 200000
+    python scripts/check_query_plans.py
+"""
+import argparse
+import json
+import sys
+sys.path.append('.')
+
+from sqlalchemy import select, desc, func, text
+from src.database import engine
+from src.models import Ticket, TicketStatus, Comment, Notification
+from src.utils.pagination import keyset_before
+
+HOT_TABLES = {"tickets", "comments", "notifications"}
+PAGE = 21  # the routes fetch limit + 1 rows
+
+
+def busiest(connection, column):
+    """Value of column with the most rows"""
+    return connection.scalar(
+        select(column).where(column.is_not(None)).group_by(column).order_by(func.count().desc()).limit(1)
+    )
+
+
+def hot_queries(connection) -> dict:
+    """The statements the hot routes run, keyed by description"""
+    employee_id = busiest(connection, Ticket.employee_id)
+    technician_id = busiest(connection, Ticket.technician_id)
+    ticket_id = busiest(connection, Comment.ticket_id)
+    user_id = busiest(connection, Notification.user_id)
+
+    window = select(Ticket.id, Ticket.created_at, Ticket.updated_at)
+    newest = (desc(Ticket.created_at), desc(Ticket.id))
+    employee_list = window.where(Ticket.employee_id == employee_id).order_by(*newest).limit(PAGE)
+    cursor = connection.execute(
+        select(Ticket.created_at, Ticket.id).where(Ticket.employee_id == employee_id)
+        .order_by(*newest).offset(PAGE - 1).limit(1)
+    ).first()
+    inbox = select(Notification).where(Notification.user_id == user_id) \
+        .order_by(desc(Notification.created_at), desc(Notification.id)).limit(PAGE)
+
+    queries = {
+        "GET /api/tickets (employee)": employee_list,
+        "GET /api/tickets (technician)":
+            window.where(Ticket.technician_id == technician_id).order_by(*newest).limit(PAGE),
+        "GET /api/tickets?status=in_progress (technician)":
+            window.where(Ticket.technician_id == technician_id, Ticket.status == TicketStatus.IN_PROGRESS)
+            .order_by(*newest).limit(PAGE),
+        "GET /api/tickets/{id}/comments":
+            select(Comment).where(Comment.ticket_id == ticket_id).order_by(Comment.created_at, Comment.id),
+        "GET /api/notifications": inbox,
+        "GET /api/notifications?unread_only=true": inbox.where(Notification.read_status == False),
+        "assignment load sync":
+            select(Ticket.technician_id, func.count())
+            .where(Ticket.technician_id.is_not(None),
+                   Ticket.status.in_([TicketStatus.PENDING, TicketStatus.IN_PROGRESS]))
+            .group_by(Ticket.technician_id),
+    }
+    if cursor is not None:
+        queries["GET /api/tickets?cursor=... (employee)"] = employee_list.where(
+            keyset_before(Ticket.created_at, Ticket.id, cursor.created_at, cursor.id)
+        )
+    return queries
+
+
+def _walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _relations(node) -> set:
+    return {child["Relation Name"] for child in _walk(node) if "Relation Name" in child}
+
+
+def explain_postgresql(connection, sql: str) -> tuple[list[str], list[str]]:
+    """(plan steps, problems with hot tables)"""
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    steps, problems = [], []
+    for node in _walk(plan[0]["Plan"]):
+        relation = node.get("Relation Name")
+        index = node.get("Index Name")
+        steps.append(" ".join(part for part in (node["Node Type"], relation, index and f"({index})") if part))
+        full_index_scan = node["Node Type"] in ("Index Scan", "Index Only Scan") and "Index Cond" not in node
+        if relation in HOT_TABLES and (node["Node Type"] == "Seq Scan" or full_index_scan):
+            problems.append(f"full scan of {relation}")
+        if node["Node Type"] in ("Sort", "Incremental Sort"):
+            problems.extend(f"sort of {table}" for table in sorted(_relations(node) & HOT_TABLES))
+    return steps, problems
+
+
+def explain_sqlite(connection, sql: str) -> tuple[list[str], list[str]]:
+    """(plan steps, problems with hot tables)"""
+    steps, problems = [], []
+    for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+        detail = row[-1]
+        steps.append(detail)
+        # SEARCH is an index lookup; SCAN visits every row, with or without an index
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in HOT_TABLES:
+            problems.append(f"full scan of {words[1]}")
+        # Every query here reads a single hot table, so a temp b-tree sorts its rows
+        if detail.startswith("USE TEMP B-TREE"):
+            problems.append(detail.lower().replace("use temp b-tree for", "sort for"))
+    return steps, problems
+
+
+def main(args) -> int:
+    explain = explain_postgresql if engine.dialect.name == "postgresql" else explain_sqlite
+    failed = False
+    with engine.connect() as connection:
+        if not args.no_analyze:
+            for table in sorted(HOT_TABLES):
+                connection.execute(text(f"ANALYZE {table}"))
+            connection.commit()
+
+        for name, query in hot_queries(connection).items():
+            sql = str(query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+            steps, problems = explain(connection, sql)
+            failed = failed or bool(problems)
+            print(f"{'❌' if problems else '✅'} {name}")
+            for step in steps:
+                print(f"     {step}")
+            for problem in sorted(set(problems)):
+                print(f"     {problem}")
+
+    if failed:
+        print("❌ Hot queries fall back to full scans or sorts; check the indexes from alembic/versions")
+        return 1
+    print("✅ All hot queries read in index order")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check hot query plans for sequential scans and sorts")
+    parser.add_argument("--no-analyze", action="store_true", help="Skip refreshing planner statistics first")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,38 @@
+"""
+Bulk import users from a CSV file
+
+Usage: python scripts/import_users.py users.csv [--batch-size N]
+"""
+import argparse
+import asyncio
+import sys
+sys.path.append('.')
+
+from src.database import AsyncSessionLocal, init_db
+from src.services.user_import import import_users, import_hash_pool
+
+
+async def run(path: str, batch_size: int) -> int:
+    with open(path, encoding="utf-8-sig") as f:
+        text = f.read()
+
+    async with AsyncSessionLocal() as db:
+        result = await import_users(db, text, batch_size=batch_size)
+
+    print(f"✅ Created: {result.created}, updated: {result.updated}, rejected: {len(result.errors)}")
+    for error in result.errors:
+        print(f"  line {error.line} ({error.username or '-'}): {error.error}")
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV")
+    parser.add_argument("path", help="CSV file with a header row")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per upsert batch")
+    args = parser.parse_args()
+
+    init_db()
+    try:
+        sys.exit(asyncio.run(run(args.path, args.batch_size)))
+    finally:
+        import_hash_pool.shutdown()
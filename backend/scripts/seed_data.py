@@ -1,19 +1,33 @@
 """
 Seed database with initial data
+
+Without options, creates the fixed test accounts. With --employees,
+--technicians and/or --tickets it also generates a large synthetic
+dataset with bulk inserts, deterministic for a given --seed and --until:
+
+    python scripts/seed_data.py --reset --employees 5000 --technicians 60 --tickets 1000000 --seed 42
 """
+import argparse
+import math
+import random
 import sys
+import time
 import uuid
+from datetime import datetime, timedelta, timezone
 sys.path.append('.')
 
-from src.database import SessionLocal, Base, engine
+from sqlalchemy import select, insert, delete, update, func, text
+from src.database import SessionLocal, Base, engine, init_db
 from src.models import User, UserRole
 # Import all models to ensure relationships are configured
-from src.models import Ticket, Comment, Notification
+from src.models import (
+    Ticket, Comment, Notification, NotificationType, NotificationCounter, TicketStatus, TicketCategory,
+    TechnicianCategory, TechnicianSubCategory, TechnicianDailyStats
+)
 from src.utils.auth import get_password_hash
-
-
-# Ensure tables exist
-Base.metadata.create_all(bind=engine)
+from src.utils.regions import normalize_region
+from src.services.search import get_search_backend
+from src.services.stats import backfill_technician_stats
 
 
 def seed_data():
@@ -21,6 +35,10 @@ def seed_data():
     db = SessionLocal()
     
     try:
+        if db.scalar(select(User.id).where(User.username == "ragel")):
+            print("Initial users already exist, skipping")
+            return
+        
         print("Creating initial users...")
         
         # Create test employee
@@ -42,78 +60,78 @@ def seed_data():
                 "nama": "Pupus Dwi Anggono",
                 "username": "pupus",
                 "wilayah": "Kantor Induk UIT JBM",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Parluhutan Harahap",
                 "username": "parluhutan",
                 "wilayah": "UPT Malang",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Alif Reza",
                 "username": "alif",
                 "wilayah": "UPT Probolinggo",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Ramadhani",
                 "username": "ramadhani",
                 "wilayah": "UPT Surabaya",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Ardhyas",
                 "username": "ardhyas",
                 "wilayah": "UPT Gresik",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Sayudha",
                 "username": "sayudha",
                 "wilayah": "UPT Madiun",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Wayan Aris",
                 "username": "wayan",
                 "wilayah": "UPT Bali",
-                "categories": '["hardware","jaringanKoneksi","zoom","aplikasi"]',
-                "sub_categories": '["SAP"]'
+                "categories": ["hardware", "jaringanKoneksi", "zoom", "aplikasi"],
+                "sub_categories": ["SAP"]
             },
             {
                 "nama": "Alfian Prasetyo",
                 "username": "alfian",
                 "wilayah": "ALL UIT",
-                "categories": '["jaringanKoneksi","aplikasi"]',
-                "sub_categories": '["Minerium","Lainnya"]'
+                "categories": ["jaringanKoneksi", "aplikasi"],
+                "sub_categories": ["Minerium", "Lainnya"]
             },
             {
                 "nama": "Hartanto Budi",
                 "username": "hartanto",
                 "wilayah": None,
-                "categories": '["aplikasi"]',
-                "sub_categories": '["Smartness"]'
+                "categories": ["aplikasi"],
+                "sub_categories": ["Smartness"]
             },
             {
                 "nama": "Kicky",
                 "username": "kicky",
                 "wilayah": None,
-                "categories": '["akun"]',
-                "sub_categories": '["Email/Korporat"]'
+                "categories": ["akun"],
+                "sub_categories": ["Email/Korporat"]
             },
             {
                 "nama": "Risma Budi",
                 "username": "risma",
                 "wilayah": None,
-                "categories": '["akun"]',
-                "sub_categories": '["VPN"]'
+                "categories": ["akun"],
+                "sub_categories": ["VPN"]
             },
         ]
         
@@ -140,7 +158,7 @@ def seed_data():
             nama="Ralisto Reddington",
             role=UserRole.ADMIN,
             nomor_wa="085843991612",
-            permissions='["all"]',
+            permissions=["all"],
             is_active=True
         )
         db.add(admin)
@@ -162,5 +180,278 @@ def seed_data():
         db.close()
 
 
+REGIONS = [
+    "Kantor Induk UIT JBM", "UPT Malang", "UPT Probolinggo", "UPT Surabaya",
+    "UPT Gresik", "UPT Madiun", "UPT Bali",
+]
+SUB_CATEGORIES = {
+    TicketCategory.APLIKASI: ["SAP", "Minerium", "Smartness", "Lainnya"],
+    TicketCategory.AKUN: ["Email/Korporat", "VPN"],
+}
+# Relative frequency of each category in generated tickets
+CATEGORY_WEIGHTS = {
+    TicketCategory.HARDWARE: 30,
+    TicketCategory.JARINGAN_KONEKSI: 25,
+    TicketCategory.APLIKASI: 25,
+    TicketCategory.AKUN: 12,
+    TicketCategory.ZOOM: 8,
+}
+DESCRIPTIONS = {
+    TicketCategory.HARDWARE: [
+        "Printer di ruang {n} tidak bisa mencetak",
+        "Laptop sering mati sendiri saat dipakai",
+        "Monitor lantai {n} berkedip terus",
+    ],
+    TicketCategory.JARINGAN_KONEKSI: [
+        "Koneksi internet lantai {n} putus-putus",
+        "Tidak bisa terhubung ke WiFi kantor",
+        "Jaringan LAN ruang {n} sangat lambat",
+    ],
+    TicketCategory.APLIKASI: [
+        "Aplikasi tidak bisa dibuka sejak pagi",
+        "Muncul error saat menyimpan data transaksi",
+        "Laporan bulanan gagal diekspor",
+    ],
+    TicketCategory.AKUN: [
+        "Lupa password akun dan perlu reset",
+        "Akun terkunci setelah salah password",
+        "Perlu akses tambahan untuk unit {n}",
+    ],
+    TicketCategory.ZOOM: [
+        "Butuh link Zoom untuk rapat direksi",
+        "Audio Zoom di ruang rapat {n} tidak keluar",
+        "Lisensi Zoom habis untuk webinar",
+    ],
+}
+COMMENTS = [
+    "Baik, segera kami cek ke lokasi", "Sudah dicoba restart tapi belum berhasil",
+    "Mohon ditunggu, sedang dalam pengecekan", "Terima kasih, sudah normal kembali",
+    "Apakah masalahnya masih terjadi?", "Sudah saya kirim foto errornya",
+    "Perlu penggantian perangkat, menunggu stok", "Masih sama, belum bisa",
+]
+RESOLUTIONS = [
+    "Sudah diperbaiki dan diuji bersama pengguna", "Perangkat diganti dengan unit cadangan",
+    "Konfigurasi diperbaiki dan akses dipulihkan", "Password direset dan akun dibuka kembali",
+]
+
+
+class Generator:
+    """Deterministic synthetic dataset writer"""
+    
+    def __init__(self, seed: int, until: datetime, days: int, batch_size: int):
+        self.rng = random.Random(seed)
+        self.until = until
+        self.days = days
+        self.batch_size = batch_size
+        self.hashed_password = get_password_hash("password")
+        self.employees: list[str] = []
+        self.technicians_by_category: dict[TicketCategory, list[str]] = {}
+    
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+    
+    def users(self, connection, employees: int, technicians: int) -> None:
+        """Insert generated employees and technicians (password: password)"""
+        employee_rows, technician_rows, categories, sub_categories = [], [], [], []
+        for i in range(employees):
+            region = self.rng.choice(REGIONS)
+            employee_rows.append({
+                "id": self.new_id(), "username": f"pegawai{i:06d}", "hashed_password": self.hashed_password,
+                "nama": f"Pegawai {i}", "role": UserRole.EMPLOYEE, "nip": f"GEN{i:07d}", "region": region,
+                "is_active": True, "is_available": True, "created_at": self.until - timedelta(days=self.days),
+            })
+            self.employees.append(employee_rows[-1]["id"])
+        for i in range(technicians):
+            user_id = self.new_id()
+            wilayah = self.rng.choice(REGIONS + ["ALL UIT"])
+            skills = self.rng.sample(list(TicketCategory), self.rng.randint(1, 3))
+            # Every category needs at least one technician
+            skills.append(list(TicketCategory)[i % len(TicketCategory)])
+            for category in set(skills):
+                categories.append({"user_id": user_id, "category": category.value})
+                self.technicians_by_category.setdefault(category, []).append(user_id)
+                for sub_category in SUB_CATEGORIES.get(category, []):
+                    if self.rng.random() < 0.5:
+                        sub_categories.append({"user_id": user_id, "sub_category": sub_category})
+            technician_rows.append({
+                "id": user_id, "username": f"teknisi{i:04d}", "hashed_password": self.hashed_password,
+                "nama": f"Teknisi {i}", "role": UserRole.TECHNICIAN, "wilayah": wilayah,
+                "wilayah_key": normalize_region(wilayah), "is_active": True, "is_available": True,
+                "assigned_tickets_count": 0, "completed_tickets_count": 0,
+                "created_at": self.until - timedelta(days=self.days),
+            })
+        
+        # Each executemany needs rows with the same keys
+        for rows in (employee_rows, technician_rows):
+            for start in range(0, len(rows), self.batch_size):
+                connection.execute(insert(User), rows[start:start + self.batch_size])
+        for model, links in ((TechnicianCategory, categories), (TechnicianSubCategory, sub_categories)):
+            if links:
+                connection.execute(insert(model), links)
+    
+    def created_at(self) -> datetime:
+        """Working-hours weighted timestamp within the window, denser towards the end"""
+        day = int(self.days * (1 - math.sqrt(self.rng.random())))
+        moment = self.until - timedelta(days=day + 1)
+        if moment.weekday() >= 5 and self.rng.random() < 0.8:
+            # Most weekend tickets move to a weekday of the same week
+            moment -= timedelta(days=moment.weekday() - 4 + self.rng.randrange(5))
+        hour = min(23, max(0, int(self.rng.gauss(11, 2.5))))
+        return moment.replace(hour=hour, minute=self.rng.randrange(60), second=self.rng.randrange(60),
+                              microsecond=self.rng.randrange(1_000_000))
+    
+    def ticket(self) -> tuple[dict, list[dict], list[dict]]:
+        """One ticket with its comments and notifications"""
+        category = self.rng.choices(list(CATEGORY_WEIGHTS), weights=list(CATEGORY_WEIGHTS.values()))[0]
+        sub_category = self.rng.choice(SUB_CATEGORIES[category]) if category in SUB_CATEGORIES else None
+        ticket_id = self.new_id()
+        employee_id = self.rng.choice(self.employees)
+        technician_id = self.rng.choice(self.technicians_by_category[category])
+        created = self.created_at()
+        
+        # Response ~ lognormal around 30 min, resolution around 4 h; recent tickets are more often still open
+        accepted = created + timedelta(seconds=self.rng.lognormvariate(math.log(1800), 1.0))
+        completed = accepted + timedelta(seconds=self.rng.lognormvariate(math.log(4 * 3600), 1.2))
+        age_days = (self.until - created).total_seconds() / 86400
+        still_open = self.rng.random() < math.exp(-age_days / 3) * 0.8
+        if accepted > self.until or (still_open and self.rng.random() < 0.4):
+            status, accepted, completed = TicketStatus.PENDING, None, None
+        elif completed > self.until or still_open:
+            status, completed = TicketStatus.IN_PROGRESS, None
+        else:
+            status = TicketStatus.COMPLETED
+        
+        last_change = completed or accepted or created
+        ticket = {
+            "id": ticket_id, "employee_id": employee_id, "technician_id": technician_id,
+            "deskripsi": self.rng.choice(DESCRIPTIONS[category]).format(n=self.rng.randint(1, 9)),
+            "kategori": category, "sub_kategori": sub_category, "status": status,
+            "resolution_notes": self.rng.choice(RESOLUTIONS) if completed else None,
+            "created_at": created, "accepted_at": accepted, "completed_at": completed,
+        }
+        
+        comments = []
+        comment_end = completed or self.until
+        for _ in range(min(8, int(self.rng.expovariate(1 / 1.5)))):
+            author = employee_id if self.rng.random() < 0.5 else technician_id
+            moment = created + (comment_end - created) * self.rng.random()
+            last_change = max(last_change, moment)
+            comments.append({
+                "id": self.new_id(), "ticket_id": ticket_id, "user_id": author,
+                "text": self.rng.choice(COMMENTS), "is_read": completed is not None or self.rng.random() < 0.5,
+                "created_at": moment,
+            })
+        ticket["updated_at"] = last_change
+        
+        notifications = []
+        events = [(technician_id, NotificationType.TICKET_ASSIGNED, "Tiket baru", created)]
+        if accepted:
+            events.append((employee_id, NotificationType.TICKET_ACCEPTED, "Tiket Anda diterima", accepted))
+        if completed:
+            events.append((employee_id, NotificationType.TICKET_COMPLETED, "Tiket Anda telah diselesaikan", completed))
+        for comment in comments:
+            recipient = technician_id if comment["user_id"] == employee_id else employee_id
+            events.append((recipient, NotificationType.NEW_COMMENT, "Komentar baru pada tiket", comment["created_at"]))
+        for user_id, notification_type, message, moment in events:
+            notifications.append({
+                "id": self.new_id(), "user_id": user_id, "ticket_id": ticket_id, "type": notification_type,
+                "message": message, "read_status": (self.until - moment).days > 2 or self.rng.random() < 0.5,
+                "created_at": moment,
+            })
+        return ticket, comments, notifications
+    
+    def tickets(self, connection, count: int) -> None:
+        """Insert tickets with comments and notifications in batches"""
+        started = time.monotonic()
+        for start in range(0, count, self.batch_size):
+            tickets, comments, notifications = [], [], []
+            for _ in range(min(self.batch_size, count - start)):
+                ticket, ticket_comments, ticket_notifications = self.ticket()
+                tickets.append(ticket)
+                comments.extend(ticket_comments)
+                notifications.extend(ticket_notifications)
+            connection.execute(insert(Ticket), tickets)
+            if comments:
+                connection.execute(insert(Comment), comments)
+            connection.execute(insert(Notification), notifications)
+            done = start + len(tickets)
+            print(f"  {done}/{count} tickets ({done / (time.monotonic() - started):.0f}/s)", end="\r")
+        print()
+
+
+def rebuild_derived(connection) -> None:
+    """Recompute everything the API maintains incrementally"""
+    open_statuses = [TicketStatus.PENDING, TicketStatus.IN_PROGRESS]
+    connection.execute(update(User).values(
+        assigned_tickets_count=select(func.count()).where(
+            Ticket.technician_id == User.id, Ticket.status.in_(open_statuses)
+        ).scalar_subquery(),
+        completed_tickets_count=select(func.count()).where(
+            Ticket.technician_id == User.id, Ticket.status == TicketStatus.COMPLETED
+        ).scalar_subquery(),
+    ).where(User.role == UserRole.TECHNICIAN))
+    
+    connection.execute(delete(NotificationCounter))
+    connection.execute(insert(NotificationCounter).from_select(
+        ["user_id", "unread_count"],
+        select(Notification.user_id, func.count())
+        .where(Notification.read_status.is_(False))
+        .group_by(Notification.user_id)
+    ))
+    
+    connection.execute(delete(TechnicianDailyStats))
+    backfill_technician_stats(connection)
+    get_search_backend().rebuild(connection)
+
+
+def generate(args) -> None:
+    """Generate the synthetic dataset described by the command line"""
+    until = (
+        datetime.fromisoformat(args.until).replace(tzinfo=timezone.utc) if args.until
+        else datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+    generator = Generator(args.seed, until, args.days, args.batch_size)
+    
+    with engine.begin() as connection:
+        print(f"Generating {args.employees} employees and {args.technicians} technicians...")
+        generator.users(connection, args.employees, args.technicians)
+    
+    if args.tickets:
+        if not generator.employees or not generator.technicians_by_category:
+            sys.exit("❌ --tickets needs at least one generated employee and technician")
+        print(f"Generating {args.tickets} tickets (seed={args.seed}, until={until.date()})...")
+        with engine.begin() as connection:
+            generator.tickets(connection, args.tickets)
+    
+    print("Rebuilding counters, statistics and search index...")
+    with engine.begin() as connection:
+        rebuild_derived(connection)
+    print("✅ Synthetic data created (all generated users use password: password)")
+
+
+def reset_database() -> None:
+    """Drop every table, including the search index and migration history"""
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS ticket_search"))
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    Base.metadata.drop_all(bind=engine)
+
+
 if __name__ == "__main__":
-    seed_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed fixed test accounts and optional synthetic data")
+    parser.add_argument("--employees", type=int, default=0, help="Generated employees")
+    parser.add_argument("--technicians", type=int, default=0, help="Generated technicians")
+    parser.add_argument("--tickets", type=int, default=0, help="Generated tickets (with comments and notifications)")
+    parser.add_argument("--days", type=int, default=365, help="Ticket history window in days")
+    parser.add_argument("--until", help="End of the window (ISO date); defaults to today, fix it for identical data")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk insert")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+    
+    if args.reset:
+        reset_database()
+    init_db()
+    seed_data()
+    if args.employees or args.technicians or args.tickets:
+        generate(args)
\ No newline at end of file
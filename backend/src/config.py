@@ -16,18 +16,69 @@ class Settings(BaseSettings):
     db_user: str = "postgres"
     db_password: str = "password"
     
+    # Read replicas for read-only routes (comma-separated URLs, empty = primary only)
+    database_replica_urls: str = ""
+    replica_sticky_seconds: float = 5.0  # a user's reads stay on the primary this long after they write
+    replica_retry_seconds: int = 30  # a failed replica is skipped this long before it is tried again
+    replica_connect_timeout_seconds: float = 1.0
+    
     # JWT
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     
+    # Password hashing
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_executor: str = "thread"  # "thread" or "process"
+    password_hash_max_queue: int = 500  # 0 = unbounded
+    
+    # Principal cache for authenticated requests
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: int = 60  # 0 disables the cache
+    
+    # Technician matching index (full reload interval across workers)
+    technician_index_ttl_seconds: int = 300
+    
+    # Automatic assignment (open-ticket counts resync interval across workers)
+    assignment_resync_seconds: int = 60
+    
+    # Bulk user import
+    bulk_import_hash_workers: int = 0  # process pool size, 0 = CPU count
+    bulk_import_batch_size: int = 500
+    
+    # SQL profiling
+    sql_echo: bool = False  # log every statement (synchronous, development only)
+    slow_query_ms: int = 200  # 0 disables the slow-query log
+    repeated_query_threshold: int = 5  # same statement this often in one request is logged as N+1
+    sql_profile_headers: bool = True  # X-DB-Query-Count / X-DB-Time-Ms / Server-Timing
+    
+    # Logging (JSON lines on stdout, written by a background thread)
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_queue_size: int = 10000  # records beyond this are dropped, not waited on
+    access_log_sample_rate: float = 0.1  # applies to access_log_sampled_routes only
+    access_log_sampled_routes: str = (
+        "GET /api/health,GET /api/ready,GET /api/metrics,GET /api/notifications/unread-count,"
+        "GET /api/tickets/{ticket_id}/comments"
+    )
+    slow_request_ms: int = 1000  # always logged regardless of sampling
+    
+    # Startup warm-up and readiness (/api/ready)
+    warmup_pool_connections: int = 5  # opened at startup so the first requests don't connect, 0 disables
+    ready_timeout_seconds: float = 2.0  # database check deadline
+    ready_max_pool_utilization: float = 0.9  # not ready above this share of pool_size + max_overflow
+    
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = True
     allowed_origins: str = "http://localhost:*,http://127.0.0.1:*"
     
+    # Search (PostgreSQL text search configuration)
+    search_language: str = "indonesian"
+    
     # Application
     app_name: str = "PLN Ticket System API"
     app_version: str = "1.0.0"
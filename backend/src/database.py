@@ -1,45 +1,340 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import get_settings
+from .utils.log import current_request
+from .utils.metrics import registry
+from .utils.sql_profiler import install_query_profiler
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Use postgresql+psycopg2 for synchronous operations
 DATABASE_URL = settings.database_url.replace("postgresql://", "postgresql+psycopg2://") \
     if "postgresql+psycopg2" not in settings.database_url else settings.database_url
 
-# Create SQLAlchemy engine
+
+def _async_url(url: str) -> str:
+    """Use asyncpg/aiosqlite for the async engines that serve API requests"""
+    return url \
+        .replace("postgresql+psycopg2://", "postgresql://") \
+        .replace("postgresql://", "postgresql+asyncpg://") \
+        .replace("sqlite://", "sqlite+aiosqlite://")
+
+
+ASYNC_DATABASE_URL = _async_url(settings.database_url)
+
+POOL_SIZE = 10
+MAX_OVERFLOW = 20
+
+pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the request pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Request pool that records how long each checkout waited"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+def _pool_options(url: str, poolclass=None) -> dict:
+    """Pool sizing for server databases; SQLite drivers pick their own pool"""
+    if url.startswith("sqlite"):
+        return {}
+    options = {"pool_size": POOL_SIZE, "max_overflow": MAX_OVERFLOW}
+    if poolclass is not None:
+        options["poolclass"] = poolclass
+    return options
+
+
+# Create SQLAlchemy engine (startup tasks and scripts)
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.debug
+    echo=settings.sql_echo,
+    **_pool_options(DATABASE_URL)
 )
 
+# Create async engine (request handling)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    echo=settings.sql_echo,
+    **_pool_options(ASYNC_DATABASE_URL, poolclass=TimedQueuePool)
+)
+
+install_query_profiler(engine, settings.slow_query_ms)
+install_query_profiler(async_engine.sync_engine, settings.slow_query_ms)
+
+
+def pool_state() -> dict:
+    """Checked-out and capacity figures of the request pool (empty for SQLite)"""
+    pool = async_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(0, pool.overflow()),
+        "utilization": checked_out / (POOL_SIZE + MAX_OVERFLOW),
+    }
+
+
+def _pool_collector(field: str):
+    def collect() -> dict:
+        state = pool_state()
+        return {(): state[field]} if field in state else {}
+    return collect
+
+
+for _field, _documentation in (
+    ("size", "Configured persistent connections in the request pool"),
+    ("checked_out", "Connections currently checked out of the request pool"),
+    ("overflow", "Overflow connections currently open beyond pool_size"),
+    ("utilization", "Checked-out connections as a fraction of pool_size + max_overflow"),
+):
+    registry.gauge(f"db_pool_{_field}", _documentation, collect=_pool_collector(_field))
+
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create AsyncSessionLocal class; objects stay loaded after commit so
+# responses can be serialized without another round trip
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency for database session
+    Dependency for async database session
     Yields database session and ensures it's closed after use
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+# Read replicas: read-only routes take a replica session unless the client
+# wrote recently (read-your-writes) or no replica is healthy
+
+read_sessions_total = registry.counter(
+    "db_read_sessions_total",
+    "Sessions opened for read-only routes, by target",
+    ("target",)
+)
+replica_failures_total = registry.counter(
+    "db_replica_failures_total",
+    "Times a replica could not hand out a connection and reads failed over",
+    ("replica",)
+)
+
+
+@dataclass
+class Replica:
+    """A replica engine and when it may be tried again after a failure"""
+    name: str
+    engine: AsyncEngine
+    down_until: float = 0.0
+
+    def is_up(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+
+class ReplicaRouter:
+    """
+    Pick the session for a read-only route
+
+    Replicas are used round robin. A client's reads stay on the primary
+    for `sticky_seconds` after a commit that wrote something on its
+    behalf; the time of that write travels with the client (see
+    middleware/read_your_writes.py), so it holds whichever worker serves
+    the next request. A replica that fails to connect is skipped for
+    `retry_seconds`, its reads going to the next one or the primary.
+    """
+
+    def __init__(self, replicas: list[Replica], sticky_seconds: float, retry_seconds: float):
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self._next = 0
+
+    def is_sticky(self, last_write: Optional[float]) -> bool:
+        """Whether a client whose last write was at `last_write` (epoch seconds) is in the sticky window"""
+        return last_write is not None and time.time() - last_write < self.sticky_seconds
+
+    def choose(self, last_write: Optional[float]) -> Optional[Replica]:
+        """Next healthy replica, or None to read from the primary"""
+        if not self.replicas or self.is_sticky(last_write):
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if replica.is_up():
+                return replica
+        return None
+
+    def mark_down(self, replica: Replica, error: BaseException) -> None:
+        replica.down_until = time.monotonic() + self.retry_seconds
+        replica_failures_total.inc(replica=replica.name)
+        logger.warning(
+            "Replica %s unavailable, reading from the primary for %ss: %r",
+            replica.name, self.retry_seconds, error
+        )
+
+    async def session(self, last_write: Optional[float]) -> AsyncSession:
+        """
+        Open a session for read-only queries
+
+        A replica session is connected before it is returned, so a replica
+        that is down fails over here instead of failing the request.
+        """
+        replica = self.choose(last_write)
+        while replica is not None:
+            db = AsyncSessionLocal(bind=replica.engine)
+            try:
+                async with asyncio.timeout(settings.replica_connect_timeout_seconds):
+                    await db.connection()
+            except (DBAPIError, OSError, TimeoutError) as e:
+                await db.close()
+                self.mark_down(replica, e)
+                replica = self.choose(last_write)
+                continue
+            read_sessions_total.inc(target="replica")
+            return db
+        read_sessions_total.inc(target="primary")
+        return AsyncSessionLocal()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"name": replica.name, "up": replica.is_up()}
+                for replica in self.replicas
+            ],
+        }
+
+
+def _create_replica(index: int, url: str) -> Replica:
+    url = _async_url(url.strip())
+    parsed = make_url(url)
+    replica_engine = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        echo=settings.sql_echo,
+        **_pool_options(url)
+    )
+    install_query_profiler(replica_engine.sync_engine, settings.slow_query_ms)
+    return Replica(name=parsed.host or parsed.database or f"replica{index}", engine=replica_engine)
+
+
+replica_router = ReplicaRouter(
+    [
+        _create_replica(index, url)
+        for index, url in enumerate(settings.database_replica_urls.split(","))
+        if url.strip()
+    ],
+    sticky_seconds=settings.replica_sticky_seconds,
+    retry_seconds=settings.replica_retry_seconds
+)
+
+registry.gauge(
+    "db_replica_up", "Whether a replica is currently used for reads", ("replica",),
+    collect=lambda: {(replica.name,): int(replica.is_up()) for replica in replica_router.replicas}
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_write(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        context = current_request()
+        if context is not None:
+            context.last_write = time.time()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+def client_last_write() -> Optional[float]:
+    """When the client of the current request last wrote (epoch seconds), if it told us"""
+    context = current_request()
+    return context.last_write if context else None
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _alembic_config():
+    from alembic.config import Config
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def init_db(revision: str = "head"):
+    """Apply pending migrations (deploy step and scripts)"""
+    from alembic import command
+    command.upgrade(_alembic_config(), revision)
+
+
+def check_schema():
+    """
+    Verify the database is at the latest migration
+    
+    Run at API startup instead of migrating, so several workers starting
+    at once never race on DDL.
+    
+    Raises:
+        RuntimeError: If migrations are pending or the database is unversioned
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    
+    heads = set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    if current != heads:
+        raise RuntimeError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+            f"expected {', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
\ No newline at end of file
@@ -3,12 +3,28 @@ Main FastAPI application
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, JSONResponse
 from .config import get_settings
-from .database import init_db
-from .routes import auth, tickets, comments
+from .database import check_schema, replica_router
+from .middleware.metrics import MetricsMiddleware
+from .middleware.profiler import QueryProfileMiddleware
+from .middleware.read_your_writes import ReadYourWritesMiddleware
+from .middleware.request_log import RequestLogMiddleware
+from .routes import auth, tickets, comments, events, notifications, stats, reports, users
+from .services.principals import principal_cache
+from .services.events import event_hub
+from .services.assignment import load_queue
+from .utils.auth import password_pool
+from .services.user_import import import_hash_pool
+from .services.warmup import warm_up, worker_state, check_readiness
+from .utils.metrics import registry
+from .utils.log import configure_logging, shutdown_logging
 
 settings = get_settings()
 
+# Replaces uvicorn's handlers, which it installs before importing the app
+configure_logging(settings.log_level, settings.log_json, settings.log_queue_size)
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
@@ -23,30 +39,87 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Last-Write"],
 )
 
+app.add_middleware(QueryProfileMiddleware)
+if replica_router.replicas:
+    app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RequestLogMiddleware)
+
+# Outermost, so latency includes CORS handling and error responses
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(tickets.router)
 app.include_router(comments.router)
+app.include_router(events.router)
+app.include_router(notifications.router)
+app.include_router(stats.router)
+app.include_router(reports.router)
+app.include_router(users.router)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    init_db()
+    """Check the schema (migrations run as a deploy step) and warm the worker up before it reports ready"""
+    check_schema()
+    await warm_up(app)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop reporting ready and release worker pools on shutdown"""
+    worker_state.ready = False
+    password_pool.shutdown()
+    import_hash_pool.shutdown()
+    shutdown_logging()
 
 
 @app.get("/api/health")
 async def health_check():
-    """Health check endpoint"""
+    """
+    Liveness probe: the process is up and serving
+    
+    Never touches the database, so a database outage does not get
+    healthy workers restarted; use /api/ready to decide on traffic.
+    """
     return {
         "status": "healthy",
+        "ready": worker_state.ready,
+        "warmup_seconds": worker_state.warmup_seconds,
         "app": settings.app_name,
-        "version": settings.app_version
+        "version": settings.app_version,
+        "password_hashing": password_pool.stats(),
+        "principal_cache": principal_cache.stats(),
+        "event_hub": event_hub.stats(),
+        "assignment": load_queue.stats(),
+        "read_replicas": replica_router.stats()
     }
 
 
+@app.get("/api/ready")
+async def readiness_check():
+    """
+    Readiness probe: warmed up, database reachable and pool headroom left
+    
+    Returns:
+        200 with the checks when the worker should receive traffic, 503 otherwise
+    """
+    ready, checks = await check_readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks}
+    )
+
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request, connection pool and worker pool metrics in Prometheus text format"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
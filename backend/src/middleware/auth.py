@@ -4,10 +4,12 @@ Authentication middleware for protected routes
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..models import User
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ..database import get_db, AsyncSessionLocal, client_last_write, replica_router
+from ..services.principals import Principal, get_principal
 from ..utils.auth import decode_token
+from ..utils.log import set_log_user
 from jose import JWTError
 
 security = HTTPBearer()
@@ -15,8 +17,8 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     """
     Get current authenticated user from JWT token
     
@@ -25,7 +27,7 @@ async def get_current_user(
         db: Database session
         
     Returns:
-        Current authenticated User object
+        Current authenticated Principal (cached snapshot of the user)
         
     Raises:
         HTTPException: If token is invalid or user not found
@@ -47,12 +49,14 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user from the principal cache, falling back to the database
+    user = await get_principal(db, user_id)
     
     if user is None:
         raise credentials_exception
     
+    set_log_user(user.id)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -63,12 +67,55 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Get current active user (additional check)"""
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_user_read_db(
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Dependency for read-only routes: a replica session for the current user
+    
+    Falls back to the primary while the client's own writes may not have
+    reached the replicas yet (REPLICA_STICKY_SECONDS) or when no replica
+    is healthy. Never write through this session.
+    """
+    db = await replica_router.session(client_last_write())
+    async with db:
+        yield db
+
+
+async def authenticate_token(token: str) -> Optional[Principal]:
+    """
+    Resolve a raw access token to an active principal
+    
+    Used by long-lived WebSocket/SSE connections, which must not hold a
+    request-scoped database session open for their whole lifetime.
+    
+    Returns:
+        Principal if the token is valid and the user is active, else None
+    """
+    try:
+        user_id = decode_token(token).get("sub")
+    except JWTError:
+        return None
+    
+    if user_id is None:
+        return None
+    
+    async with AsyncSessionLocal() as db:
+        user = await get_principal(db, user_id)
+    
+    if user is None or not user.is_active:
+        return None
+    
+    set_log_user(user.id)
+    return user
@@ -0,0 +1,59 @@
+"""
+Request metrics middleware
+
+Counts requests per route template, method and status, observes their
+latency and tracks how many are in flight. Routes are labelled by their
+template (/api/tickets/{ticket_id}) so series stay bounded; requests that
+match no route share the "unmatched" label.
+"""
+import time
+from ..utils.metrics import registry
+
+requests_total = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ("method", "route", "status")
+)
+request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is sent",
+    ("method", "route")
+)
+requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ("method",)
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware so streaming responses are not buffered"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight.dec(method=method)
+            # The router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            requests_total.inc(method=method, route=route, status=str(status_code))
+            request_duration_seconds.observe(elapsed, method=method, route=route)
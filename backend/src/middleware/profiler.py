@@ -0,0 +1,54 @@
+"""
+Per-request database cost
+
+Each HTTP request gets a QueryProfile. The number of statements and time
+spent in the database are returned as X-DB-Query-Count, X-DB-Time-Ms and
+a Server-Timing entry (browser dev tools show the latter), and statements
+repeated within one request are logged as a likely N+1. Statements run
+by a streaming body after the headers went out are still profiled and
+logged, but not reflected in the headers.
+"""
+import logging
+from ..config import get_settings
+from ..utils.sql_profiler import start_profile, stop_profile
+
+settings = get_settings()
+logger = logging.getLogger("sql.profile")
+
+
+class QueryProfileMiddleware:
+    """Pure ASGI middleware; the profile is also available as request.state.query_profile"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile()
+        scope.setdefault("state", {})["query_profile"] = profile
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.sql_profile_headers:
+                milliseconds = f"{profile.seconds * 1000:.1f}"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-query-count", str(profile.count).encode()),
+                    (b"x-db-time-ms", milliseconds.encode()),
+                    (b"server-timing", f'db;dur={milliseconds};desc="{profile.count} queries"'.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            stop_profile(token)
+            route = getattr(scope.get("route"), "path", scope.get("path"))
+            for statement, executions, seconds in profile.repeated(settings.repeated_query_threshold):
+                logger.warning(
+                    "Possible N+1: statement ran %d times (%.1f ms) in %s %s: %s",
+                    executions, seconds * 1000, scope["method"], route, " ".join(statement.split()),
+                    extra={"executions": executions, "route": route, "statement": statement}
+                )
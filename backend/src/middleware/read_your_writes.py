@@ -0,0 +1,91 @@
+"""
+Read-your-writes across workers
+
+After a request commits a write, the response carries the time of that
+write as a signed `last_write` cookie and an X-Last-Write header. A
+client that sends either back (cookie for browsers, header for API
+clients) has its reads routed to the primary for REPLICA_STICKY_SECONDS
+by whichever worker serves them, since no worker has to remember the
+write itself. The signature keeps clients from pinning themselves to the
+primary indefinitely with a made-up time.
+"""
+import hashlib
+import hmac
+import math
+import time
+from http.cookies import SimpleCookie
+from typing import Optional
+from ..config import get_settings
+from ..utils.log import current_request
+
+settings = get_settings()
+
+COOKIE_NAME = "last_write"
+HEADER_NAME = b"x-last-write"
+
+# Tolerated clock skew between workers when checking a write time from the future
+MAX_SKEW_SECONDS = 5
+
+
+def _signature(milliseconds: str) -> str:
+    key = f"read-your-writes:{settings.secret_key}".encode()
+    return hmac.new(key, milliseconds.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def encode_last_write(at: float) -> str:
+    """Signed token for a write at `at` (epoch seconds)"""
+    milliseconds = str(int(at * 1000))
+    return f"{milliseconds}.{_signature(milliseconds)}"
+
+
+def decode_last_write(token: str) -> Optional[float]:
+    """Write time from a token, or None when it is malformed, forged or from the future"""
+    milliseconds, _, signature = token.partition(".")
+    if not milliseconds.isdigit() or not hmac.compare_digest(signature, _signature(milliseconds)):
+        return None
+    at = int(milliseconds) / 1000
+    return at if at <= time.time() + MAX_SKEW_SECONDS else None
+
+
+def _client_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == HEADER_NAME:
+            return value.decode("latin-1")
+    for name, value in scope.get("headers", []):
+        if name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(COOKIE_NAME)
+            if morsel is not None:
+                return morsel.value
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware; must run inside RequestLogMiddleware, which binds the request context"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        context = current_request()
+        if scope["type"] != "http" or context is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _client_token(scope)
+        context.last_write = decode_last_write(token) if token else None
+        received = context.last_write
+
+        async def send_with_last_write(message):
+            # A commit during this request moved last_write forward (see database._record_write)
+            if message["type"] == "http.response.start" and context.last_write != received:
+                value = encode_last_write(context.last_write).encode()
+                max_age = math.ceil(settings.replica_sticky_seconds)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (HEADER_NAME, value),
+                    (b"set-cookie", b"%s=%s; Max-Age=%d; Path=/; HttpOnly; SameSite=Lax" % (
+                        COOKIE_NAME.encode(), value, max_age
+                    )),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_last_write)
@@ -0,0 +1,107 @@
+"""
+Request ids and structured access logging
+
+Every HTTP request gets a request id (the client's X-Request-ID when it
+sends a sane one) that is echoed in the response and attached to every
+log record written while serving it. When the request finishes, one
+access record is written with its route, status, latency and SQL cost.
+Routes listed in ACCESS_LOG_SAMPLED_ROUTES are logged at
+ACCESS_LOG_SAMPLE_RATE only, except for server errors and slow requests,
+which are always logged.
+"""
+import logging
+import random
+import re
+import time
+import uuid
+from ..config import get_settings
+from ..utils.log import bind_request, reset_request
+
+settings = get_settings()
+access_logger = logging.getLogger("access")
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _parse_sampled_routes(raw: str) -> set[tuple]:
+    """'GET /api/x, /api/y' -> {("GET", "/api/x"), (None, "/api/y")}"""
+    routes = set()
+    for entry in raw.split(","):
+        parts = entry.split()
+        if len(parts) == 2:
+            routes.add((parts[0].upper(), parts[1]))
+        elif len(parts) == 1:
+            routes.add((None, parts[0]))
+    return routes
+
+
+SAMPLED_ROUTES = _parse_sampled_routes(settings.access_log_sampled_routes)
+
+
+def _sample_rate(method: str, route: str) -> float:
+    if (method, route) in SAMPLED_ROUTES or (None, route) in SAMPLED_ROUTES:
+        return settings.access_log_sample_rate
+    return 1.0
+
+
+def _request_id(scope) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"x-request-id":
+            candidate = value.decode("latin-1")
+            if REQUEST_ID_PATTERN.match(candidate):
+                return candidate
+            break
+    return uuid.uuid4().hex
+
+
+class RequestLogMiddleware:
+    """Pure ASGI middleware; must wrap QueryProfileMiddleware to see the SQL totals"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope)
+        token = bind_request(request_id)
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode())
+                ]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", "unmatched")
+
+            rate = _sample_rate(method, route)
+            always = status_code >= 500 or elapsed_ms >= settings.slow_request_ms
+            if always or rate >= 1.0 or random.random() < rate:
+                profile = scope.get("state", {}).get("query_profile")
+                access_logger.info(
+                    "%s %s %d %.1fms", method, scope["path"], status_code, elapsed_ms,
+                    extra={
+                        "method": method,
+                        "route": route,
+                        "path": scope["path"],
+                        "status": status_code,
+                        "latency_ms": round(elapsed_ms, 1),
+                        "sql_count": profile.count if profile else None,
+                        "sql_ms": round(profile.seconds * 1000, 1) if profile else None,
+                        "sample_rate": 1.0 if always else rate,
+                        "client": (scope.get("client") or (None,))[0],
+                    }
+                )
+            reset_request(token)
@@ -1,10 +1,14 @@
 """
 Database models package
 """
-from .user import User, Employee, Technician, Admin, UserRole
+from .user import (
+    User, Employee, Technician, Admin, UserRole,
+    TechnicianCategory, TechnicianSubCategory, AdminPermission
+)
 from .ticket import Ticket, TicketStatus, TicketCategory
 from .comment import Comment
-from .notification import Notification, NotificationType
+from .notification import Notification, NotificationType, NotificationCounter
+from .stats import TechnicianDailyStats
 
 __all__ = [
     "User",
@@ -12,10 +16,15 @@ __all__ = [
     "Technician",
     "Admin",
     "UserRole",
+    "TechnicianCategory",
+    "TechnicianSubCategory",
+    "AdminPermission",
     "Ticket",
     "TicketStatus",
     "TicketCategory",
     "Comment",
     "Notification",
     "NotificationType",
+    "NotificationCounter",
+    "TechnicianDailyStats",
 ]
\ No newline at end of file
@@ -1,9 +1,10 @@
 """
 Comment database model
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from datetime import datetime, timezone
 from ..database import Base
 
 
@@ -12,13 +13,22 @@ class Comment(Base):
     __tablename__ = "comments"
     
     id = Column(String, primary_key=True, index=True)
-    ticket_id = Column(String, ForeignKey("tickets.id"), nullable=False, index=True)
+    ticket_id = Column(String, ForeignKey("tickets.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     
     text = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        index=True
+    )
+    
+    __table_args__ = (
+        Index("ix_comments_ticket_created", ticket_id, created_at, id),
+    )
     
     # Relationships
     ticket = relationship("Ticket", back_populates="comments")
@@ -1,10 +1,11 @@
 """
 Notification database model
 """
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Enum, JSON, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from datetime import datetime, timezone
 from ..database import Base
 
 
@@ -21,16 +22,34 @@ class Notification(Base):
     __tablename__ = "notifications"
     
     id = Column(String, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
     ticket_id = Column(String, ForeignKey("tickets.id"), nullable=False, index=True)
     
     type = Column(Enum(NotificationType), nullable=False)
     message = Column(String, nullable=False)
-    read_status = Column(Boolean, default=False, index=True)
+    read_status = Column(Boolean, default=False)
     extra_data = Column(JSON, nullable=True)  # Renamed from 'metadata' (reserved word)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        index=True
+    )
+    
+    __table_args__ = (
+        Index("ix_notifications_user_created", user_id, created_at.desc(), id.desc()),
+        Index("ix_notifications_user_read_created", user_id, read_status, created_at.desc(), id.desc()),
+    )
     
     # Relationships
     user = relationship("User")
-    ticket = relationship("Ticket", back_populates="notifications")
\ No newline at end of file
+    ticket = relationship("Ticket", back_populates="notifications")
+
+
+class NotificationCounter(Base):
+    """Per-user unread notification count, maintained on every write"""
+    __tablename__ = "notification_counters"
+    
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
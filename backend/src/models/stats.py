@@ -0,0 +1,28 @@
+"""
+Technician statistics rollup model
+"""
+from sqlalchemy import Column, String, Date, Enum, ForeignKey, Integer, Float
+from ..database import Base
+from .ticket import TicketCategory
+
+
+class TechnicianDailyStats(Base):
+    """
+    Per technician, day and category totals, maintained on accept/complete
+    
+    Accepts are bucketed by the day the ticket was accepted and completions
+    by the day it was completed. Averages are sum / count.
+    """
+    __tablename__ = "technician_daily_stats"
+    
+    technician_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    kategori = Column(Enum(TicketCategory), primary_key=True)
+    
+    # accepted_at - created_at
+    accepted_count = Column(Integer, nullable=False, default=0)
+    response_seconds_sum = Column(Float, nullable=False, default=0)
+    
+    # completed_at - accepted_at
+    completed_count = Column(Integer, nullable=False, default=0)
+    resolution_seconds_sum = Column(Float, nullable=False, default=0)
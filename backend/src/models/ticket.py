@@ -1,10 +1,11 @@
 """
 Ticket database model
 """
-from sqlalchemy import Column, String, DateTime, Enum, ForeignKey, Integer, Text
+from sqlalchemy import Column, String, DateTime, Enum, ForeignKey, Integer, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from datetime import datetime, timezone
 from ..database import Base
 
 
@@ -29,8 +30,8 @@ class Ticket(Base):
     __tablename__ = "tickets"
     
     id = Column(String, primary_key=True, index=True)
-    employee_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    technician_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
+    employee_id = Column(String, ForeignKey("users.id"), nullable=False)
+    technician_id = Column(String, ForeignKey("users.id"), nullable=True)
     
     deskripsi = Column(Text, nullable=False)
     kategori = Column(Enum(TicketCategory), nullable=False, index=True)
@@ -39,10 +40,39 @@ class Ticket(Base):
     
     resolution_notes = Column(Text, nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Python-side default keeps sub-second precision on every backend, so the
+    # (created_at, id) keyset used for cursor pagination is strictly ordered
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        index=True
+    )
     accepted_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Bumped on every change to the ticket or its comments; serves as the
+    # validator for conditional GETs
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=True
+    )
+    
+    # Shaped after the list queries (newest first, keyset on created_at, id);
+    # see alembic/versions/0002_hot_query_indexes.py and 0004_sort_order_indexes.py
+    __table_args__ = (
+        Index("ix_tickets_employee_created", employee_id, created_at.desc(), id.desc()),
+        Index("ix_tickets_technician_created", technician_id, created_at.desc(), id.desc()),
+        Index("ix_tickets_technician_status_created", technician_id, status, created_at.desc(), id.desc()),
+        Index(
+            "ix_tickets_open_technician", technician_id,
+            postgresql_where=text("status IN ('PENDING', 'IN_PROGRESS')"),
+            sqlite_where=text("status IN ('PENDING', 'IN_PROGRESS')")
+        ),
+    )
+    
     # Relationships (without back_populates since User model is simplified)
     employee = relationship("User", foreign_keys=[employee_id])
     technician = relationship("User", foreign_keys=[technician_id])
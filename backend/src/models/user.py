@@ -1,11 +1,13 @@
 """
 User database models - Simplified without polymorphic inheritance
 """
-from sqlalchemy import Column, String, DateTime, Enum, Boolean, Integer
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Enum, Boolean, Integer, ForeignKey, Index
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 import enum
 from ..database import Base
+from ..utils.regions import normalize_region
 
 
 class UserRole(str, enum.Enum):
@@ -31,20 +33,74 @@ class User(Base):
     
     # Technician-specific fields (null for non-technicians)
     wilayah = Column(String, nullable=True)
-    categories = Column(String, nullable=True)  # JSON array as string
-    sub_categories = Column(String, nullable=True)  # JSON array as string
+    wilayah_key = Column(String, nullable=True, index=True)  # normalize_region(wilayah), NULL for central
     assigned_tickets_count = Column(Integer, default=0)
     completed_tickets_count = Column(Integer, default=0)
     
     # Admin-specific fields (null for non-admins)
     nomor_wa = Column(String, nullable=True)
-    permissions = Column(String, nullable=True)  # JSON array as string
     
     is_active = Column(Boolean, default=True)
     is_available = Column(Boolean, default=True)  # For technicians
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Skills and permissions live in junction tables; the proxies read and
+    # assign them as plain lists of strings
+    category_links = relationship("TechnicianCategory", cascade="all, delete-orphan")
+    sub_category_links = relationship("TechnicianSubCategory", cascade="all, delete-orphan")
+    permission_links = relationship("AdminPermission", cascade="all, delete-orphan")
+    
+    categories = association_proxy(
+        "category_links", "category",
+        creator=lambda category: TechnicianCategory(category=category)
+    )
+    sub_categories = association_proxy(
+        "sub_category_links", "sub_category",
+        creator=lambda sub_category: TechnicianSubCategory(sub_category=sub_category)
+    )
+    permissions = association_proxy(
+        "permission_links", "permission",
+        creator=lambda permission: AdminPermission(permission=permission)
+    )
+    
+    @validates("wilayah")
+    def _set_wilayah_key(self, key, value):
+        self.wilayah_key = normalize_region(value)
+        return value
+
+
+class TechnicianCategory(Base):
+    """Ticket category handled by a technician"""
+    __tablename__ = "technician_categories"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String, primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_technician_categories_category", "category", "user_id"),
+    )
+
+
+class TechnicianSubCategory(Base):
+    """Ticket sub-category handled by a technician"""
+    __tablename__ = "technician_sub_categories"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    sub_category = Column(String, primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_technician_sub_categories_sub_category", "sub_category", "user_id"),
+    )
+
+
+class AdminPermission(Base):
+    """Permission granted to an admin"""
+    __tablename__ = "admin_permissions"
+    
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    permission = Column(String, primary_key=True)
 
 
 # Convenience classes for type hints (not actual models)
@@ -2,18 +2,23 @@
 Authentication routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_db
 from ..models import User
 from ..schemas.auth import LoginRequest, LoginResponse, RefreshTokenRequest, UserResponse
-from ..utils.auth import verify_password, create_access_token, create_refresh_token, decode_token
+from ..utils.auth import (
+    verify_password_async, get_password_hash_async, password_needs_rehash,
+    create_access_token, create_refresh_token, decode_token
+)
+from ..utils.executor import ExecutorBusy
 from jose import JWTError
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/login")
-async def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     """
     Authenticate user and return JWT tokens
     
@@ -28,7 +33,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
         HTTPException: If credentials are invalid
     """
     # Find user by username
-    user = db.query(User).filter(User.username == request.username).first()
+    user = await db.scalar(select(User).where(User.username == request.username))
     
     if not user:
         raise HTTPException(
@@ -37,8 +42,17 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify password
-    if not verify_password(request.password, user.hashed_password):
+    # Verify password off the event loop
+    try:
+        password_valid = await verify_password_async(request.password, user.hashed_password)
+    except ExecutorBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server sedang sibuk, silakan coba lagi",
+            headers={"Retry-After": "1"},
+        )
+    
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Username atau password salah",
@@ -52,6 +66,14 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="Akun tidak aktif"
         )
     
+    # Upgrade the stored hash if the configured bcrypt cost changed
+    if password_needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await get_password_hash_async(request.password)
+            await db.commit()
+        except ExecutorBusy:
+            pass
+    
     # Create tokens
     access_token = create_access_token(data={"sub": user.id, "role": user.role})
     refresh_token = create_refresh_token(data={"sub": user.id})
@@ -71,7 +93,7 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh")
-async def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
     """
     Refresh access token using refresh token
     
@@ -103,7 +125,7 @@ async def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_
             )
         
         # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).where(User.id == user_id))
         
         if not user or not user.is_active:
             raise HTTPException(
@@ -1,14 +1,23 @@
 """
 Comment routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select
+from typing import Optional
+from datetime import datetime, timezone
 import uuid
 from ..database import get_db
-from ..models import User, Ticket, Comment
+from ..models import Ticket, Comment, NotificationType
 from ..schemas.comment import AddCommentRequest, CommentResponse, CommentListResponse
-from ..middleware.auth import get_current_active_user
+from ..middleware.auth import get_current_active_user, get_user_read_db
+from ..services.principals import Principal
+from ..services.search import index_ticket
+from ..services.events import publish_ticket_event
+from ..services.notifications import notify
+from ..utils.pagination import encode_cursor, decode_cursor, keyset_after
+from ..utils.http_cache import make_etag, etag_matches, set_etag, not_modified
 
 router = APIRouter(prefix="/api/tickets", tags=["comments"])
 
@@ -17,12 +26,12 @@ router = APIRouter(prefix="/api/tickets", tags=["comments"])
 async def add_comment(
     ticket_id: str,
     request: AddCommentRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Add a comment to a ticket"""
     # Verify ticket exists
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
     
     if not ticket:
         raise HTTPException(
@@ -52,8 +61,20 @@ async def add_comment(
     )
     
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    # Bump the ticket version so cached ticket/comment responses revalidate
+    ticket.updated_at = datetime.now(timezone.utc)
+    await db.flush()
+    await index_ticket(db, ticket_id)
+    
+    # Notify the other party (both parties when an admin comments)
+    for recipient_id in {ticket.employee_id, ticket.technician_id} - {current_user.id, None}:
+        await notify(
+            db, recipient_id, ticket_id, NotificationType.NEW_COMMENT,
+            f"Komentar baru dari {current_user.nama}",
+            {"comment_id": comment.id}
+        )
+    await db.commit()
+    await db.refresh(comment)
     
     # Prepare response with user info
     comment_response = CommentResponse(
@@ -67,18 +88,37 @@ async def add_comment(
         created_at=comment.created_at
     )
     
+    publish_ticket_event(
+        NotificationType.NEW_COMMENT,
+        ticket,
+        {"comment": comment_response.model_dump(mode="json")}
+    )
+    
     return comment_response
 
 
 @router.get("/{ticket_id}/comments", response_model=CommentListResponse)
 async def get_comments(
     ticket_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    since: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    """Get all comments for a ticket"""
+    """
+    Get comments for a ticket, oldest first
+
+    `since` (a comment ID or ISO timestamp) returns only newer comments,
+    so polling clients fetch just the delta; a comment ID that is not on
+    this ticket is rejected with 400. With `limit`, the response
+    carries a `next_cursor` to pass back as `cursor` for the next page.
+    Supports If-None-Match against the ticket's version.
+    """
     # Verify ticket exists
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.scalar(select(Ticket).where(Ticket.id == ticket_id))
     
     if not ticket:
         raise HTTPException(
@@ -99,29 +139,81 @@ async def get_comments(
             detail="Anda tidak memiliki akses ke tiket ini"
         )
     
-    # Get comments
-    comments = db.query(Comment).filter(
+    etag = make_etag(ticket.id, ticket.updated_at, str(request.url.query))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    # Get comments with their authors in the same query
+    query = select(Comment).options(joinedload(Comment.user)).where(
         Comment.ticket_id == ticket_id
-    ).order_by(Comment.created_at).all()
+    )
     
-    # Build response with user names
-    comment_responses = []
-    for comment in comments:
-        user = db.query(User).filter(User.id == comment.user_id).first()
-        comment_responses.append(
-            CommentResponse(
-                id=comment.id,
-                ticket_id=comment.ticket_id,
-                user_id=comment.user_id,
-                user_nama=user.nama if user else "Unknown",
-                user_type=user.role if user else "employee",
-                text=comment.text,
-                is_read=comment.is_read,
-                created_at=comment.created_at
+    if since:
+        try:
+            since_at = datetime.fromisoformat(since)
+        except ValueError:
+            since_at = None
+        
+        if since_at is not None:
+            if since_at.tzinfo is not None:
+                since_at = since_at.astimezone(timezone.utc)
+            query = query.filter(Comment.created_at > since_at)
+        else:
+            # Treat it as the ID of the last comment the client has seen; an
+            # unknown ID must not look like "no new comments" to a poller
+            since_created_at = await db.scalar(select(Comment.created_at).where(
+                Comment.id == since, Comment.ticket_id == ticket_id
+            ))
+            if since_created_at is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Komentar 'since' tidak ditemukan pada tiket ini"
+                )
+            query = query.filter(
+                keyset_after(Comment.created_at, Comment.id, since_created_at, since)
             )
+    
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        query = query.filter(
+            keyset_after(Comment.created_at, Comment.id, cursor_created_at, cursor_id)
+        )
+    
+    query = query.order_by(Comment.created_at, Comment.id)
+    
+    next_cursor = None
+    if limit is not None:
+        comments = (await db.scalars(query.limit(limit + 1))).all()
+        if len(comments) > limit:
+            comments = comments[:limit]
+            next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+    else:
+        comments = (await db.scalars(query)).all()
+    
+    # Build response with user names
+    comment_responses = [
+        CommentResponse(
+            id=comment.id,
+            ticket_id=comment.ticket_id,
+            user_id=comment.user_id,
+            user_nama=comment.user.nama if comment.user else "Unknown",
+            user_type=comment.user.role if comment.user else "employee",
+            text=comment.text,
+            is_read=comment.is_read,
+            created_at=comment.created_at
         )
+        for comment in comments
+    ]
     
     return CommentListResponse(
         comments=comment_responses,
-        total=len(comment_responses)
-    )
\ No newline at end of file
+        total=len(comment_responses),
+        next_cursor=next_cursor
+    )
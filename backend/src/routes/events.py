@@ -0,0 +1,108 @@
+"""
+Real-time event routes (WebSocket and Server-Sent Events)
+"""
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer
+from fastapi.security.http import HTTPAuthorizationCredentials
+from typing import Optional
+from ..middleware.auth import authenticate_token
+from ..services.events import event_hub
+
+router = APIRouter(tags=["events"])
+
+optional_security = HTTPBearer(auto_error=False)
+
+# Seconds between SSE keepalive comments (keeps proxies from closing idle streams)
+KEEPALIVE_INTERVAL = 15
+
+
+@router.websocket("/ws/notifications/{user_id}")
+async def notifications_socket(websocket: WebSocket, user_id: str, token: Optional[str] = None):
+    """
+    Push ticket and comment events to a device over WebSocket
+    
+    Authenticate with `?token=<access token>` or an `Authorization: Bearer`
+    header; the token subject must match `user_id`.
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    
+    principal = await authenticate_token(token) if token else None
+    if principal is None or principal.id != user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    queue = event_hub.subscribe(user_id)
+    
+    async def forward_events():
+        while True:
+            await websocket.send_json(await queue.get())
+    
+    async def wait_for_disconnect():
+        # Client messages (e.g. pings) are ignored; this only detects close
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+    
+    tasks = [asyncio.create_task(forward_events()), asyncio.create_task(wait_for_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        event_hub.unsubscribe(user_id, queue)
+
+
+@router.get("/api/events")
+async def event_stream(
+    request: Request,
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Push ticket and comment events as Server-Sent Events
+    
+    Authenticate with a Bearer header or `?token=` (EventSource cannot
+    set headers).
+    """
+    if credentials is not None:
+        token = credentials.credentials
+    
+    principal = await authenticate_token(token) if token else None
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    async def stream():
+        # Subscribed only once the body is sent: if the client goes away before
+        # that, the generator never runs and its finally could not unsubscribe
+        queue = event_hub.subscribe(principal.id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_hub.unsubscribe(principal.id, queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
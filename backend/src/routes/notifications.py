@@ -0,0 +1,96 @@
+"""
+Notification inbox routes
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc
+from typing import Optional
+from ..database import get_db
+from ..models import Notification
+from ..schemas.notification import NotificationListResponse, UnreadCountResponse
+from ..middleware.auth import get_current_active_user
+from ..services.principals import Principal
+from ..services.notifications import get_unread_count, mark_read, mark_all_read
+from ..utils.pagination import encode_cursor, decode_cursor, keyset_before
+
+router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+
+
+@router.get("", response_model=NotificationListResponse)
+async def get_notifications(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    unread_only: bool = False,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the current user's notifications, newest first"""
+    query = select(Notification).where(Notification.user_id == current_user.id)
+    
+    if unread_only:
+        query = query.where(Notification.read_status == False)
+    
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        query = query.where(
+            keyset_before(Notification.created_at, Notification.id, cursor_created_at, cursor_id)
+        )
+    
+    notifications = (await db.scalars(
+        query.order_by(desc(Notification.created_at), desc(Notification.id)).limit(limit + 1)
+    )).all()
+    
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        next_cursor = encode_cursor(notifications[-1].created_at, notifications[-1].id)
+    
+    return NotificationListResponse(
+        notifications=notifications,
+        unread_count=await get_unread_count(db, current_user.id),
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_notification_unread_count(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the unread notification count (app badge)"""
+    return UnreadCountResponse(unread_count=await get_unread_count(db, current_user.id))
+
+
+@router.post("/read-all", response_model=UnreadCountResponse)
+async def read_all_notifications(
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark all of the current user's notifications as read"""
+    await mark_all_read(db, current_user.id)
+    await db.commit()
+    
+    return UnreadCountResponse(unread_count=await get_unread_count(db, current_user.id))
+
+
+@router.post("/{notification_id}/read", response_model=UnreadCountResponse)
+async def read_notification(
+    notification_id: str,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mark a single notification as read"""
+    if not await mark_read(db, current_user.id, notification_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notifikasi tidak ditemukan"
+        )
+    await db.commit()
+    
+    return UnreadCountResponse(unread_count=await get_unread_count(db, current_user.id))
@@ -0,0 +1,63 @@
+"""
+Admin report routes
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import date
+from ..middleware.auth import get_current_active_user
+from ..services.principals import Principal
+from ..services.reports import export_csv, export_jsonl
+
+router = APIRouter(prefix="/api/reports", tags=["reports"])
+
+EXPORT_FORMATS = {
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+    "jsonl": (export_jsonl, "application/x-ndjson"),
+}
+
+
+@router.get("/tickets/export")
+async def export_tickets(
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_summary: bool = False,
+    current_user: Principal = Depends(get_current_active_user)
+):
+    """
+    Stream every ticket created in a date range (admin only)
+    
+    Args:
+        format: "csv" or "jsonl"
+        date_from: First creation day to include (inclusive)
+        date_to: Last creation day to include (inclusive)
+        include_summary: Append per-technician totals, completion rate and
+            average resolution time
+    
+    Returns:
+        Streamed export, sent as an attachment
+    
+    Raises:
+        HTTPException: If user is not an admin or the range is inverted
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Hanya admin yang dapat mengekspor laporan"
+        )
+    
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Rentang tanggal tidak valid"
+        )
+    
+    exporter, media_type = EXPORT_FORMATS[format]
+    filename = f"tickets_{date_from or 'awal'}_{date_to or 'akhir'}.{format}"
+    
+    return StreamingResponse(
+        exporter(date_from=date_from, date_to=date_to, include_summary=include_summary),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,55 @@
+"""
+Statistics routes
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Optional
+from datetime import date
+from ..database import get_db
+from ..models import User, UserRole
+from ..schemas.stats import TechnicianStatsResponse
+from ..middleware.auth import get_current_active_user
+from ..services.principals import Principal
+from ..services.stats import get_technician_stats
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+@router.get("/technicians/{technician_id}", response_model=TechnicianStatsResponse)
+async def get_technician_statistics(
+    technician_id: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a technician's completed totals, average times and category breakdown
+    
+    Args:
+        technician_id: Technician ID
+        date_from: First day to include (inclusive)
+        date_to: Last day to include (inclusive)
+    
+    Returns:
+        Statistics read from the daily rollup
+    
+    Raises:
+        HTTPException: If the user may not view these statistics or the
+            technician does not exist
+    """
+    if current_user.role != "admin" and current_user.id != technician_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Anda tidak memiliki akses ke statistik ini"
+        )
+    
+    role = await db.scalar(select(User.role).where(User.id == technician_id))
+    if role != UserRole.TECHNICIAN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Teknisi tidak ditemukan"
+        )
+    
+    return await get_technician_stats(db, technician_id, date_from=date_from, date_to=date_to)
@@ -1,17 +1,30 @@
 """
 Ticket routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
 from typing import Optional
 import uuid
 from datetime import datetime
 from ..database import get_db
-from ..models import User, Ticket, Employee, Technician, TicketStatus, TicketCategory
-from ..schemas.ticket import CreateTicketRequest, CompleteTicketRequest, TicketResponse, TicketListResponse
-from ..schemas.auth import TechnicianResponse
-from ..middleware.auth import get_current_active_user
+from ..models import Ticket, Technician, TicketStatus, TicketCategory, NotificationType
+from ..schemas.ticket import (
+    CreateTicketRequest, CompleteTicketRequest, TicketResponse, TicketListResponse,
+    TicketSearchResult, TicketSearchResponse
+)
+from ..schemas.auth import TechnicianResponse, TechnicianSkillCountsResponse
+from ..middleware.auth import get_current_active_user, get_user_read_db
+from ..services.principals import Principal
+from ..utils.pagination import encode_cursor, decode_cursor, keyset_before
+from ..utils.http_cache import make_etag, etag_matches, set_etag, not_modified
+from ..services.tickets import TICKET_LOAD_OPTIONS, scope_to_user, hydrate_tickets, transition_ticket
+from ..services.search import get_search_backend, index_ticket
+from ..services.events import publish_ticket_event
+from ..services.notifications import notify
+from ..services.matching import technician_index, count_skills
+from ..services.assignment import auto_assign, record_assignment, record_completion
+from ..services.stats import record_accept, record_complete
 
 router = APIRouter(prefix="/api/tickets", tags=["tickets"])
 
@@ -19,10 +32,16 @@ router = APIRouter(prefix="/api/tickets", tags=["tickets"])
 @router.post("", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 async def create_ticket(
     request: CreateTicketRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Create a new ticket"""
+    """
+    Create a new ticket
+    
+    Without a technician_id the ticket goes to the eligible technician
+    (by category, sub-category and the employee's region) with the fewest
+    open tickets.
+    """
     # Verify current user is an employee
     if current_user.role != "employee":
         raise HTTPException(
@@ -30,8 +49,19 @@ async def create_ticket(
             detail="Hanya employee yang dapat membuat tiket"
         )
     
+    technician_id = request.technician_id
+    if technician_id is None:
+        technician_id = await auto_assign(
+            db, request.kategori.value, request.sub_kategori, current_user.region
+        )
+        if technician_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tidak ada teknisi yang tersedia untuk kategori ini"
+            )
+    
     # Verify technician exists
-    technician = db.query(Technician).filter(Technician.id == request.technician_id).first()
+    technician = await db.scalar(select(Technician).where(Technician.id == technician_id))
     if not technician:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -42,7 +72,7 @@ async def create_ticket(
     ticket = Ticket(
         id=str(uuid.uuid4()),
         employee_id=current_user.id,
-        technician_id=request.technician_id,
+        technician_id=technician_id,
         deskripsi=request.deskripsi,
         kategori=request.kategori,
         sub_kategori=request.sub_kategori,
@@ -50,37 +80,54 @@ async def create_ticket(
     )
     
     db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
+    await db.flush()
+    await index_ticket(db, ticket.id)
+    await record_assignment(db, technician.id)
+    await notify(
+        db, technician.id, ticket.id, NotificationType.TICKET_ASSIGNED,
+        f"Tiket baru dari {current_user.nama}"
+    )
+    await db.commit()
+    await db.refresh(ticket)
     
     # Add employee and technician names
     ticket.employee_nama = current_user.nama
-    ticket.employee_nip = current_user.nip if isinstance(current_user, Employee) else None
+    ticket.employee_nip = current_user.nip
     ticket.technician_nama = technician.nama
     
+    publish_ticket_event(NotificationType.TICKET_ASSIGNED, ticket)
+    
     return ticket
 
 
 @router.get("", response_model=TicketListResponse)
 async def get_tickets(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
     status: Optional[TicketStatus] = None,
     category: Optional[TicketCategory] = None,
     employee_id: Optional[str] = None,
     technician_id: Optional[str] = None,
     search: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    """Get tickets with filtering and pagination"""
-    query = db.query(Ticket)
+    """
+    Get tickets with filtering and pagination
+
+    Pass the `next_cursor` of the previous response as `cursor` to page
+    by keyset instead of OFFSET. The exact total is computed by default
+    in page mode only; set `include_total` to override.
     
+    Responses carry an ETag derived from the page's (id, updated_at)
+    window; a matching If-None-Match gets 304 before any hydration.
+    """
     # Filter based on user role
-    if current_user.role == "employee":
-        query = query.filter(Ticket.employee_id == current_user.id)
-    elif current_user.role == "technician":
-        query = query.filter(Ticket.technician_id == current_user.id)
+    query = scope_to_user(select(Ticket), current_user)
     
     # Apply filters
     if status:
@@ -92,31 +139,154 @@ async def get_tickets(
     if technician_id:
         query = query.filter(Ticket.technician_id == technician_id)
     if search:
-        query = query.filter(Ticket.deskripsi.ilike(f"%{search}%"))
+        query = query.filter(Ticket.id.in_(get_search_backend().match_ids(search)))
+    
+    # Get total count only when requested
+    if include_total is None:
+        include_total = cursor is None
+    total = await db.scalar(
+        select(func.count()).select_from(query.subquery())
+    ) if include_total else None
+    
+    # Apply pagination, fetching one extra row to detect the next page
+    query = query.order_by(desc(Ticket.created_at), desc(Ticket.id))
+    if cursor is not None:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        query = query.filter(
+            keyset_before(Ticket.created_at, Ticket.id, cursor_created_at, cursor_id)
+        )
+        page = None
+    else:
+        query = query.offset((page - 1) * limit)
+    
+    window = (await db.execute(
+        query.with_only_columns(Ticket.id, Ticket.created_at, Ticket.updated_at).limit(limit + 1)
+    )).all()
+    
+    etag = make_etag(current_user.id, str(request.url.query), total, [tuple(row) for row in window])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    next_cursor = None
+    if len(window) > limit:
+        window = window[:limit]
+        next_cursor = encode_cursor(window[-1].created_at, window[-1].id)
     
-    # Get total count
-    total = query.count()
+    # Load the full rows for the window only, keeping the window's order
+    loaded = {
+        ticket.id: ticket
+        for ticket in (await db.scalars(
+            select(Ticket).options(*TICKET_LOAD_OPTIONS).where(Ticket.id.in_([row.id for row in window]))
+        )).all()
+    } if window else {}
+    tickets = [loaded[row.id] for row in window if row.id in loaded]
     
-    # Apply pagination
-    offset = (page - 1) * limit
-    tickets = query.order_by(desc(Ticket.created_at)).offset(offset).limit(limit).all()
+    await hydrate_tickets(db, tickets, current_user.id)
     
     return TicketListResponse(
         tickets=tickets,
         total=total,
         page=page,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/search", response_model=TicketSearchResponse)
+async def search_tickets(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over descriptions, resolution notes and comments
+    
+    Results are ranked by relevance and carry a highlighted snippet.
+    """
+    hits = get_search_backend().ranked(q)
+    query = select(Ticket, hits.c.rank, hits.c.snippet) \
+        .join(hits, hits.c.ticket_id == Ticket.id) \
+        .options(*TICKET_LOAD_OPTIONS)
+    rows = (await db.execute(
+        scope_to_user(query, current_user)
+        .order_by(desc(hits.c.rank), desc(Ticket.created_at))
+        .limit(limit)
+    )).all()
+    
+    await hydrate_tickets(db, [ticket for ticket, _, _ in rows], current_user.id)
+    
+    return TicketSearchResponse(
+        results=[
+            TicketSearchResult(ticket=ticket, rank=rank, snippet=snippet)
+            for ticket, rank, snippet in rows
+        ],
+        query=q
+    )
+
+
+@router.get("/technicians", response_model=list[TechnicianResponse])
+async def get_technicians(
+    category: Optional[TicketCategory] = None,
+    sub_category: Optional[str] = None,
+    region: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get available technicians matching a category, sub-category and region
+    
+    Served from the in-memory matching index; regional technicians come
+    first, followed by central (ALL UIT) technicians. The session only
+    connects when the index needs reloading, and that reload reads the
+    primary so a lagging replica cannot put stale technicians in the index.
+    """
+    await technician_index.ensure_loaded(db)
+    
+    return technician_index.match(
+        category=category.value if category else None,
+        sub_category=sub_category,
+        region=region
     )
 
 
+@router.get("/technicians/skills", response_model=TechnicianSkillCountsResponse)
+async def get_technician_skill_counts(
+    region: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Count available technicians per category and sub-category
+    
+    Args:
+        region: Only count technicians serving this region (central
+            technicians serve every region)
+    
+    Returns:
+        Technician counts keyed by category and by sub-category
+    """
+    return await count_skills(db, region=region)
+
+
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(
     ticket_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    """Get a single ticket by ID"""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    """Get a single ticket by ID (supports If-None-Match)"""
+    ticket = (await db.execute(
+        select(Ticket.id, Ticket.employee_id, Ticket.technician_id, Ticket.updated_at)
+        .where(Ticket.id == ticket_id)
+    )).first()
     
     if not ticket:
         raise HTTPException(
@@ -137,14 +307,53 @@ async def get_ticket(
             detail="Anda tidak memiliki akses ke tiket ini"
         )
     
+    etag = make_etag(current_user.id, ticket.id, ticket.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    ticket = await db.scalar(
+        select(Ticket).options(*TICKET_LOAD_OPTIONS).where(Ticket.id == ticket_id)
+    )
+    await hydrate_tickets(db, [ticket], current_user.id)
+    
     return ticket
 
 
+async def _transition_error(
+    db: AsyncSession,
+    ticket_id: str,
+    technician_id: str,
+    wrong_status_detail: str
+) -> HTTPException:
+    """Explain why a conditional transition matched no ticket (failure path only)"""
+    ticket = (await db.execute(
+        select(Ticket.technician_id).where(Ticket.id == ticket_id)
+    )).first()
+    
+    if ticket is None:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tiket tidak ditemukan"
+        )
+    
+    if ticket.technician_id != technician_id:
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Tiket ini tidak ditugaskan kepada Anda"
+        )
+    
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=wrong_status_detail
+    )
+
+
 @router.post("/{ticket_id}/accept", response_model=TicketResponse)
 async def accept_ticket(
     ticket_id: str,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Accept a ticket (technician only)"""
     if current_user.role != "technician":
@@ -153,31 +362,29 @@ async def accept_ticket(
             detail="Hanya teknisi yang dapat menerima tiket"
         )
     
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tiket tidak ditemukan"
-        )
+    ticket = await transition_ticket(
+        db, ticket_id, current_user.id, TicketStatus.PENDING,
+        status=TicketStatus.IN_PROGRESS,
+        accepted_at=datetime.utcnow()
+    )
     
-    if ticket.technician_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Tiket ini tidak ditugaskan kepada Anda"
-        )
+    if ticket is None:
+        raise await _transition_error(db, ticket_id, current_user.id, "Tiket sudah diterima sebelumnya")
     
-    if ticket.status != TicketStatus.PENDING:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Tiket sudah diterima sebelumnya"
-        )
+    await record_accept(db, ticket)
+    await notify(
+        db, ticket.employee_id, ticket.id, NotificationType.TICKET_ACCEPTED,
+        f"Tiket Anda diterima oleh {current_user.nama}"
+    )
     
-    ticket.status = TicketStatus.IN_PROGRESS
-    ticket.accepted_at = datetime.utcnow()
+    # Fill the names and comment counts GET /api/tickets/{id} returns
+    ticket = await db.scalar(
+        select(Ticket).options(*TICKET_LOAD_OPTIONS).where(Ticket.id == ticket.id)
+    )
+    await hydrate_tickets(db, [ticket], current_user.id)
+    await db.commit()
     
-    db.commit()
-    db.refresh(ticket)
+    publish_ticket_event(NotificationType.TICKET_ACCEPTED, ticket)
     
     return ticket
 
@@ -186,8 +393,8 @@ async def accept_ticket(
 async def complete_ticket(
     ticket_id: str,
     request: CompleteTicketRequest,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Complete a ticket (technician only)"""
     if current_user.role != "technician":
@@ -196,49 +403,36 @@ async def complete_ticket(
             detail="Hanya teknisi yang dapat menyelesaikan tiket"
         )
     
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tiket tidak ditemukan"
-        )
+    ticket = await transition_ticket(
+        db, ticket_id, current_user.id, TicketStatus.IN_PROGRESS,
+        status=TicketStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+        resolution_notes=request.resolution_notes
+    )
     
-    if ticket.technician_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Tiket ini tidak ditugaskan kepada Anda"
+    if ticket is None:
+        raise await _transition_error(
+            db, ticket_id, current_user.id,
+            "Tiket harus dalam status 'In Progress' untuk diselesaikan"
         )
     
-    if ticket.status != TicketStatus.IN_PROGRESS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Tiket harus dalam status 'In Progress' untuk diselesaikan"
-        )
+    # Core updates skip ORM flush events, so the counters, load queue and
+    # rollup are maintained explicitly in the same transaction
+    await index_ticket(db, ticket.id)
+    await record_completion(db, current_user.id)
+    await record_complete(db, ticket)
+    await notify(
+        db, ticket.employee_id, ticket.id, NotificationType.TICKET_COMPLETED,
+        f"Tiket Anda telah diselesaikan oleh {current_user.nama}"
+    )
     
-    ticket.status = TicketStatus.COMPLETED
-    ticket.completed_at = datetime.utcnow()
-    ticket.resolution_notes = request.resolution_notes
+    # Fill the names and comment counts GET /api/tickets/{id} returns
+    ticket = await db.scalar(
+        select(Ticket).options(*TICKET_LOAD_OPTIONS).where(Ticket.id == ticket.id)
+    )
+    await hydrate_tickets(db, [ticket], current_user.id)
+    await db.commit()
     
-    db.commit()
-    db.refresh(ticket)
+    publish_ticket_event(NotificationType.TICKET_COMPLETED, ticket)
     
     return ticket
-
-
-@router.get("/technicians", response_model=list[TechnicianResponse])
-async def get_technicians(
-    category: Optional[TicketCategory] = None,
-    region: Optional[str] = None,
-    db: Session = Depends(get_db)
-):
-    """Get available technicians (for matching)"""
-    query = db.query(Technician).filter(Technician.is_available == True)
-    
-    # Filter will be done in-memory since categories/regions are JSON arrays
-    technicians = query.all()
-    
-    # TODO: Implement proper filtering based on category and region
-    # For now, return all available technicians
-    
-    return technicians
\ No newline at end of file
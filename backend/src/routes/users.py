@@ -0,0 +1,46 @@
+"""
+User administration routes
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..schemas.auth import UserImportResponse
+from ..middleware.auth import get_current_active_user
+from ..services.principals import Principal
+from ..services.user_import import import_users
+
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+
+@router.post("/import", response_model=UserImportResponse)
+async def import_users_csv(
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or update employees, technicians and admins from a CSV file (admin only)
+    
+    Rows are matched on username; see services.user_import for the columns.
+    
+    Returns:
+        Created/updated counts and the rows that were rejected
+    
+    Raises:
+        HTTPException: If user is not an admin or the file is not UTF-8 text
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Hanya admin yang dapat mengimpor user"
+        )
+    
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File harus berupa CSV dengan encoding UTF-8"
+        )
+    
+    return await import_users(db, text)
@@ -48,12 +48,38 @@ class TechnicianResponse(UserResponse):
     completed_tickets_count: Optional[int] = 0
 
 
+class TechnicianSkillCountsResponse(BaseModel):
+    """Available technician counts per category and sub-category"""
+    categories: dict[str, int]
+    sub_categories: dict[str, int]
+
+
 class AdminResponse(UserResponse):
     """Admin response schema"""
     nomor_wa: str
     permissions: Optional[list[str]] = None
 
 
+class UserImportError(BaseModel):
+    """A rejected row in a bulk user import"""
+    line: int
+    username: Optional[str] = None
+    error: str
+    
+    class Config:
+        from_attributes = True
+
+
+class UserImportResponse(BaseModel):
+    """Bulk user import result"""
+    created: int
+    updated: int
+    errors: list[UserImportError]
+    
+    class Config:
+        from_attributes = True
+
+
 class LoginResponse(BaseModel):
     """Complete login response"""
     token: str
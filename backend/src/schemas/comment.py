@@ -2,6 +2,7 @@
 Comment schemas for request/response validation
 """
 from pydantic import BaseModel, Field
+from typing import Optional
 from datetime import datetime
 from ..models import UserRole
 
@@ -29,4 +30,5 @@ class CommentResponse(BaseModel):
 class CommentListResponse(BaseModel):
     """Comment list response"""
     comments: list[CommentResponse]
-    total: int
\ No newline at end of file
+    total: int
+    next_cursor: Optional[str] = None
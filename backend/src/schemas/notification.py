@@ -0,0 +1,36 @@
+"""
+Notification schemas for request/response validation
+"""
+from pydantic import BaseModel, Field, AliasChoices
+from typing import Optional
+from datetime import datetime
+from ..models import NotificationType
+
+
+class NotificationResponse(BaseModel):
+    """Notification response schema"""
+    id: str
+    user_id: str
+    ticket_id: str
+    type: NotificationType
+    message: str
+    read_status: bool = False
+    metadata: Optional[dict] = Field(
+        None, validation_alias=AliasChoices("extra_data", "metadata")
+    )
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class NotificationListResponse(BaseModel):
+    """Keyset-paginated notification list response"""
+    notifications: list[NotificationResponse]
+    unread_count: int
+    next_cursor: Optional[str] = None
+
+
+class UnreadCountResponse(BaseModel):
+    """Unread notification counter"""
+    unread_count: int
@@ -0,0 +1,28 @@
+"""
+Statistics schemas for response validation
+"""
+from pydantic import BaseModel
+from typing import Optional
+from datetime import date
+from ..models import TicketCategory
+
+
+class CategoryStatsResponse(BaseModel):
+    """Per-category technician statistics"""
+    kategori: TicketCategory
+    accepted_count: int
+    completed_count: int
+    avg_response_seconds: Optional[float] = None
+    avg_resolution_seconds: Optional[float] = None
+
+
+class TechnicianStatsResponse(BaseModel):
+    """Technician statistics over an optional date range"""
+    technician_id: str
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    accepted_count: int
+    completed_count: int
+    avg_response_seconds: Optional[float] = None  # accepted_at - created_at
+    avg_resolution_seconds: Optional[float] = None  # completed_at - accepted_at
+    categories: list[CategoryStatsResponse]
@@ -12,7 +12,7 @@ class CreateTicketRequest(BaseModel):
     deskripsi: str = Field(..., min_length=10, max_length=500)
     kategori: TicketCategory
     sub_kategori: Optional[str] = None
-    technician_id: str
+    technician_id: Optional[str] = None  # None assigns the least-loaded eligible technician
 
 
 class CompleteTicketRequest(BaseModel):
@@ -38,6 +38,7 @@ class TicketResponse(BaseModel):
     created_at: datetime
     accepted_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -46,11 +47,25 @@ class TicketResponse(BaseModel):
 class TicketListResponse(BaseModel):
     """Paginated ticket list response"""
     tickets: list[TicketResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     limit: int
+    next_cursor: Optional[str] = None
     
     @property
     def has_more(self) -> bool:
         """Check if there are more pages"""
-        return (self.page * self.limit) < self.total
\ No newline at end of file
+        return self.next_cursor is not None
+
+
+class TicketSearchResult(BaseModel):
+    """Single ranked search hit"""
+    ticket: TicketResponse
+    rank: float
+    snippet: Optional[str] = None
+
+
+class TicketSearchResponse(BaseModel):
+    """Ranked ticket search response"""
+    results: list[TicketSearchResult]
+    query: str
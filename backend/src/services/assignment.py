@@ -0,0 +1,186 @@
+"""
+Least-loaded automatic ticket assignment
+
+A min-heap keyed by each technician's open-ticket count (pending plus
+in progress) picks the least-loaded eligible technician without scanning
+the tickets table per request. The heap is synced from one grouped query
+over tickets on first use and on a TTL, which also corrects drift from
+other worker processes. Between syncs it tracks committed creates and
+completions, and an automatic pick reserves its slot immediately so
+concurrent requests spread across technicians.
+"""
+import asyncio
+import heapq
+import time
+from typing import Iterable, Optional
+from sqlalchemy import event, select, update, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..config import get_settings
+from ..models import Ticket, TicketStatus, User
+from .matching import technician_index
+
+settings = get_settings()
+
+OPEN_STATUSES = (TicketStatus.PENDING, TicketStatus.IN_PROGRESS)
+
+
+class LoadQueue:
+    """Min-heap of technicians by open-ticket count, with lazy deletion"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.synced_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._counts: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def load(self, counts: dict[str, int]) -> None:
+        """Replace every count, e.g. from a fresh database aggregate"""
+        self._counts = dict(counts)
+        self._heap = [(count, technician_id) for technician_id, count in self._counts.items()]
+        heapq.heapify(self._heap)
+        self.synced_at = time.monotonic()
+
+    def adjust(self, technician_id: str, delta: int) -> None:
+        """Change a technician's open-ticket count"""
+        count = max(0, self._counts.get(technician_id, 0) + delta)
+        self._counts[technician_id] = count
+        heapq.heappush(self._heap, (count, technician_id))
+
+        # Superseded entries stay in the heap until popped; compact once they dominate
+        if len(self._heap) > 4 * len(self._counts) + 64:
+            self.load(self._counts)
+
+    def pick(self, eligible: Iterable[str]) -> Optional[str]:
+        """
+        Reserve the least-loaded eligible technician
+
+        Pops entries in load order, skipping superseded ones, until an
+        eligible technician surfaces; the ineligible entries popped along
+        the way are pushed back. The winner's count is incremented before
+        returning, so the caller must release it if the ticket is not
+        created.
+        """
+        eligible = set(eligible)
+        for technician_id in eligible - self._counts.keys():
+            self.adjust(technician_id, 0)
+
+        chosen = None
+        skipped = []
+        while self._heap:
+            count, technician_id = heapq.heappop(self._heap)
+            if self._counts.get(technician_id) != count:
+                continue
+            if technician_id in eligible:
+                chosen = technician_id
+                break
+            skipped.append((count, technician_id))
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+
+        if chosen is not None:
+            self.adjust(chosen, 1)
+        return chosen
+
+    async def ensure_synced(self, db: AsyncSession) -> None:
+        """Reload counts from the tickets table on first use and after the TTL"""
+        if self.synced_at is not None and time.monotonic() - self.synced_at < self.ttl:
+            return
+        async with self._lock:
+            if self.synced_at is not None and time.monotonic() - self.synced_at < self.ttl:
+                return
+            rows = await db.execute(
+                select(Ticket.technician_id, func.count())
+                .where(Ticket.technician_id.is_not(None), Ticket.status.in_(OPEN_STATUSES))
+                .group_by(Ticket.technician_id)
+            )
+            self.load({technician_id: count for technician_id, count in rows.all()})
+
+    def stats(self) -> dict:
+        return {
+            "technicians": len(self._counts),
+            "open_tickets": sum(self._counts.values()),
+            "heap_size": len(self._heap),
+        }
+
+
+load_queue = LoadQueue(ttl=settings.assignment_resync_seconds)
+
+
+async def auto_assign(
+    db: AsyncSession,
+    category: str,
+    sub_category: Optional[str] = None,
+    region: Optional[str] = None
+) -> Optional[str]:
+    """
+    Choose the least-loaded technician for a new ticket
+
+    Eligibility follows the matching index (category, sub-category and
+    region). The pick is reserved on the queue and released automatically
+    if the session ends without committing.
+
+    Returns:
+        Technician ID, or None if nobody is eligible
+    """
+    await technician_index.ensure_loaded(db)
+    await load_queue.ensure_synced(db)
+
+    eligible = technician_index.match(category=category, sub_category=sub_category, region=region)
+    technician_id = load_queue.pick(entry.id for entry in eligible)
+    if technician_id is not None:
+        db.info.setdefault("load_reservations", []).append(technician_id)
+    return technician_id
+
+
+async def record_assignment(db: AsyncSession, technician_id: str) -> None:
+    """Count a newly assigned open ticket, inside the caller's transaction"""
+    await db.execute(
+        update(User)
+        .where(User.id == technician_id)
+        .values(assigned_tickets_count=func.coalesce(User.assigned_tickets_count, 0) + 1)
+    )
+    reservations = db.info.get("load_reservations", [])
+    if technician_id in reservations:
+        # auto_assign already counted it on the queue
+        reservations.remove(technician_id)
+        db.info.setdefault("load_reserved", []).append(technician_id)
+    else:
+        db.info.setdefault("load_deltas", []).append((technician_id, 1))
+
+
+async def record_completion(db: AsyncSession, technician_id: str) -> None:
+    """Move a ticket from the open count to the completed count"""
+    await db.execute(
+        update(User)
+        .where(User.id == technician_id)
+        .values(
+            assigned_tickets_count=case(
+                (User.assigned_tickets_count > 0, User.assigned_tickets_count - 1),
+                else_=0
+            ),
+            completed_tickets_count=func.coalesce(User.completed_tickets_count, 0) + 1
+        )
+    )
+    db.info.setdefault("load_deltas", []).append((technician_id, -1))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_load_changes(session: Session) -> None:
+    deltas = session.info.pop("load_deltas", [])
+    reserved = session.info.pop("load_reserved", [])
+    for technician_id, delta in deltas:
+        load_queue.adjust(technician_id, delta)
+    # Cached technician entries carry the counters that just changed
+    technician_index.invalidate({technician_id for technician_id, _ in deltas} | set(reserved))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_load_reservations(session: Session, transaction) -> None:
+    """Give back picks whose ticket was never committed"""
+    if transaction.parent is not None:
+        return
+    session.info.pop("load_deltas", None)
+    for technician_id in session.info.pop("load_reserved", []) + session.info.pop("load_reservations", []):
+        load_queue.adjust(technician_id, -1)
@@ -0,0 +1,88 @@
+"""
+In-process pub/sub hub for pushing ticket events to connected clients
+
+Each WebSocket/SSE connection subscribes a bounded queue under its user
+ID; routes publish after committing a change. The hub only reaches
+connections held by the same worker process.
+"""
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from ..models import Ticket, NotificationType
+
+
+class EventHub:
+    """Fan out events to every connection of the target users"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a new connection for a user"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        """Remove a connection; drops the user once they have none left"""
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def publish(self, user_ids: Iterable[Optional[str]], event: dict) -> None:
+        """
+        Queue an event for every connection of the given users
+
+        Never blocks: a slow consumer whose queue is full loses its oldest
+        event rather than holding up the publishing request.
+        """
+        self.published += 1
+        for user_id in {user_id for user_id in user_ids if user_id}:
+            for queue in self._subscribers.get(user_id, ()):
+                if queue.full():
+                    queue.get_nowait()
+                    self.dropped += 1
+                queue.put_nowait(event)
+                self.delivered += 1
+
+    def stats(self) -> dict:
+        """Connection and delivery counters"""
+        return {
+            "users": len(self._subscribers),
+            "connections": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+event_hub = EventHub()
+
+
+def ticket_event(event_type: NotificationType, ticket: Ticket, data: Optional[dict] = None) -> dict:
+    """Build the payload pushed to clients for a ticket change"""
+    return {
+        "type": event_type.value,
+        "ticket_id": ticket.id,
+        "status": ticket.status.value,
+        "data": data or {},
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def publish_ticket_event(event_type: NotificationType, ticket: Ticket, data: Optional[dict] = None) -> None:
+    """Push a ticket event to both parties of the ticket"""
+    event_hub.publish(
+        [ticket.employee_id, ticket.technician_id],
+        ticket_event(event_type, ticket, data)
+    )
@@ -0,0 +1,258 @@
+"""
+In-memory technician matching index
+
+Technician skills live in the technician_categories and
+technician_sub_categories junction tables (FR-003, FR-009). The index
+holds inverted sets keyed by category, sub-category and region so the
+per-request match never touches the database. Technicians changed by a
+committed session are reloaded by ID on the next lookup; a periodic full
+reload picks up changes made by other worker processes.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import event, select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from ..config import get_settings
+from ..models import User, UserRole, TechnicianCategory, TechnicianSubCategory
+from ..utils.regions import normalize_region
+
+settings = get_settings()
+
+TECHNICIAN_LOAD_OPTIONS = (
+    selectinload(User.category_links),
+    selectinload(User.sub_category_links),
+)
+
+
+def normalize_skill(value: str) -> str:
+    """Normalize a category or sub-category to a lookup key"""
+    return value.strip().lower()
+
+
+@dataclass(frozen=True)
+class TechnicianEntry:
+    """Parsed technician snapshot (serializes as TechnicianResponse)"""
+    id: str
+    nama: str
+    role: UserRole
+    created_at: Optional[datetime]
+    wilayah: Optional[str]
+    categories: list[str]
+    sub_categories: list[str]
+    is_available: bool
+    assigned_tickets_count: int
+    completed_tickets_count: int
+
+    @property
+    def region_key(self) -> Optional[str]:
+        return normalize_region(self.wilayah)
+
+    @classmethod
+    def from_user(cls, user: User) -> Optional["TechnicianEntry"]:
+        """Build an entry, or None if the user should not be matched"""
+        if user.role != UserRole.TECHNICIAN or not user.is_active or user.is_available is False:
+            return None
+        return cls(
+            id=user.id,
+            nama=user.nama,
+            role=user.role,
+            created_at=user.created_at,
+            wilayah=user.wilayah,
+            categories=list(user.categories),
+            sub_categories=list(user.sub_categories),
+            is_available=True,
+            assigned_tickets_count=user.assigned_tickets_count or 0,
+            completed_tickets_count=user.completed_tickets_count or 0
+        )
+
+
+class TechnicianIndex:
+    """Inverted indexes over available technicians"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._stale: set[str] = set()
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.entries: dict[str, TechnicianEntry] = {}
+        self.by_category: dict[str, set[str]] = {}
+        self.by_sub_category: dict[str, set[str]] = {}
+        self.by_region: dict[str, set[str]] = {}
+        self.central: set[str] = set()
+
+    def _add(self, entry: TechnicianEntry) -> None:
+        self.entries[entry.id] = entry
+        for category in entry.categories:
+            self.by_category.setdefault(normalize_skill(category), set()).add(entry.id)
+        for sub_category in entry.sub_categories:
+            self.by_sub_category.setdefault(normalize_skill(sub_category), set()).add(entry.id)
+        if entry.region_key is None:
+            self.central.add(entry.id)
+        else:
+            self.by_region.setdefault(entry.region_key, set()).add(entry.id)
+
+    def remove(self, technician_id: str) -> None:
+        """Drop a technician from every index"""
+        if self.entries.pop(technician_id, None) is None:
+            return
+        for index in (self.by_category, self.by_sub_category, self.by_region):
+            for key in [key for key, ids in index.items() if technician_id in ids]:
+                index[key].discard(technician_id)
+                if not index[key]:
+                    del index[key]
+        self.central.discard(technician_id)
+
+    def upsert(self, technician_id: str, entry: Optional[TechnicianEntry]) -> None:
+        """Replace a technician's entry; None removes it"""
+        self.remove(technician_id)
+        if entry is not None:
+            self._add(entry)
+
+    def load(self, users: list[User]) -> None:
+        """Rebuild every index from a full list of users"""
+        self._reset()
+        for user in users:
+            entry = TechnicianEntry.from_user(user)
+            if entry is not None:
+                self._add(entry)
+        self.loaded_at = time.monotonic()
+
+    def invalidate(self, technician_ids: Iterable[str]) -> None:
+        """Mark technicians for reloading on the next lookup"""
+        self._stale.update(technician_ids)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self.loaded_at is not None
+            and time.monotonic() - self.loaded_at < self.ttl
+            and not self._stale
+        )
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """
+        Bring the index up to date before a lookup
+
+        Does a full load on first use and whenever the TTL has passed;
+        otherwise reloads only the technicians invalidated since. `db`
+        must read from the primary: rows loaded from a lagging replica
+        would stay in the index until the next full reload.
+        """
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            query = select(User).where(User.role == UserRole.TECHNICIAN).options(*TECHNICIAN_LOAD_OPTIONS)
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= self.ttl:
+                self._stale.clear()
+                self.load((await db.scalars(query)).all())
+                return
+            stale, self._stale = self._stale, set()
+            users = {
+                user.id: user
+                for user in (await db.scalars(query.where(User.id.in_(stale)))).all()
+            }
+            for technician_id in stale:
+                user = users.get(technician_id)
+                self.upsert(technician_id, TechnicianEntry.from_user(user) if user else None)
+
+    def match(
+        self,
+        category: Optional[str] = None,
+        sub_category: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> list[TechnicianEntry]:
+        """
+        Find technicians for a ticket
+
+        Regional technicians match only their own region; central
+        technicians ("ALL UIT" or no wilayah) match every region. If no one
+        lists the requested sub-category, fall back to category-only
+        matches rather than returning nothing.
+        """
+        region_key = normalize_region(region)
+        if region_key is None:
+            candidates = set(self.entries)
+        else:
+            candidates = self.by_region.get(region_key, set()) | self.central
+
+        if category:
+            candidates = candidates & self.by_category.get(normalize_skill(category), set())
+
+        if sub_category:
+            narrowed = candidates & self.by_sub_category.get(normalize_skill(sub_category), set())
+            candidates = narrowed or candidates
+
+        # Regional technicians first, then central ones
+        return sorted(
+            (self.entries[technician_id] for technician_id in candidates),
+            key=lambda entry: (entry.region_key is None, entry.nama)
+        )
+
+
+technician_index = TechnicianIndex(ttl=settings.technician_index_ttl_seconds)
+
+
+def _available_technicians(region: Optional[str] = None):
+    """Indexed filter for available technicians serving a region"""
+    conditions = [
+        User.role == UserRole.TECHNICIAN,
+        User.is_active.is_(True),
+        User.is_available.is_not(False),
+    ]
+    region_key = normalize_region(region)
+    if region_key is not None:
+        conditions.append(or_(User.wilayah_key == region_key, User.wilayah_key.is_(None)))
+    return conditions
+
+
+async def count_skills(db: AsyncSession, region: Optional[str] = None) -> dict[str, dict[str, int]]:
+    """
+    Count available technicians per category and sub-category
+
+    Aggregated in SQL over the junction tables, joined to users through
+    the indexed role and wilayah_key columns.
+    """
+    counts = {}
+    for name, column in (
+        ("categories", TechnicianCategory.category),
+        ("sub_categories", TechnicianSubCategory.sub_category),
+    ):
+        rows = await db.execute(
+            select(column, func.count())
+            .join(User, User.id == column.class_.user_id)
+            .where(*_available_technicians(region))
+            .group_by(column)
+            .order_by(column)
+        )
+        counts[name] = {skill: count for skill, count in rows.all()}
+    return counts
+
+
+@event.listens_for(Session, "after_flush")
+def _track_technician_changes(session: Session, flush_context) -> None:
+    """Collect technicians touched by a flush; invalidated once the session commits"""
+    changed = session.info.setdefault("technician_changes", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            if obj.role == UserRole.TECHNICIAN or obj.id in technician_index.entries:
+                changed.add(obj.id)
+        elif isinstance(obj, (TechnicianCategory, TechnicianSubCategory)) and obj.user_id:
+            changed.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_technician_changes(session: Session) -> None:
+    technician_index.invalidate(session.info.pop("technician_changes", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_technician_changes(session: Session) -> None:
+    session.info.pop("technician_changes", None)
@@ -0,0 +1,96 @@
+"""
+Notification persistence and materialized unread counters
+
+Every write that changes a notification's read state also adjusts the
+owner's row in notification_counters inside the same transaction, so
+reading the badge count is a primary-key lookup.
+"""
+import uuid
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import engine
+from ..models import Notification, NotificationType, NotificationCounter
+
+
+def _increment_unread(user_id: str, delta: int):
+    """Build an upsert that adds delta to a user's unread counter"""
+    dialect_insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(NotificationCounter).values(user_id=user_id, unread_count=delta)
+    return statement.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={"unread_count": NotificationCounter.unread_count + delta}
+    )
+
+
+async def notify(
+    db: AsyncSession,
+    user_id: str,
+    ticket_id: str,
+    notification_type: NotificationType,
+    message: str,
+    extra_data: Optional[dict] = None
+) -> Notification:
+    """Add an unread notification and bump the recipient's counter (caller commits)"""
+    notification = Notification(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        ticket_id=ticket_id,
+        type=notification_type,
+        message=message,
+        read_status=False,
+        extra_data=extra_data
+    )
+    db.add(notification)
+    await db.execute(_increment_unread(user_id, 1))
+    return notification
+
+
+async def get_unread_count(db: AsyncSession, user_id: str) -> int:
+    """Read a user's unread counter"""
+    count = await db.scalar(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    )
+    return count or 0
+
+
+async def mark_read(db: AsyncSession, user_id: str, notification_id: str) -> bool:
+    """
+    Mark one notification as read (caller commits)
+
+    Returns:
+        True if the notification exists and belongs to the user
+    """
+    result = await db.execute(
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == user_id,
+            Notification.read_status == False
+        )
+        .values(read_status=True)
+    )
+    if result.rowcount:
+        await db.execute(_increment_unread(user_id, -result.rowcount))
+        return True
+    
+    exists = await db.scalar(
+        select(Notification.id).where(
+            Notification.id == notification_id,
+            Notification.user_id == user_id
+        )
+    )
+    return exists is not None
+
+
+async def mark_all_read(db: AsyncSession, user_id: str) -> int:
+    """Mark all of a user's notifications as read in one UPDATE (caller commits)"""
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.read_status == False)
+        .values(read_status=True)
+    )
+    if result.rowcount:
+        await db.execute(_increment_unread(user_id, -result.rowcount))
+    return result.rowcount
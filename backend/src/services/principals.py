@@ -0,0 +1,80 @@
+"""
+Cached snapshots of authenticated users
+
+get_current_user resolves the JWT subject to a Principal. Principals are
+cached in-process so authenticated polling requests skip the users table;
+any ORM update or delete of a User drops its entry once the session
+commits, so a concurrent request cannot re-cache the old row in between.
+"""
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..config import get_settings
+from ..models import User, UserRole
+from ..utils.cache import TTLCache
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The subset of User needed to authorize a request"""
+    id: str
+    role: UserRole
+    nama: str
+    nip: Optional[str]
+    region: Optional[str]
+    is_active: bool
+
+
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds
+)
+
+
+async def get_principal(db: AsyncSession, user_id: str) -> Optional[Principal]:
+    """Get a principal from the cache, loading it from the database on a miss"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = (await db.execute(
+        select(User.id, User.role, User.nama, User.nip, User.region, User.is_active)
+        .where(User.id == user_id)
+    )).first()
+    if row is None:
+        return None
+
+    principal = Principal(
+        id=row.id,
+        role=row.role,
+        nama=row.nama,
+        nip=row.nip,
+        region=row.region,
+        is_active=bool(row.is_active)
+    )
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+@event.listens_for(Session, "after_flush")
+def _track_principal_changes(session: Session, flush_context) -> None:
+    """Collect users updated or deleted by a flush; evicted once the session commits"""
+    changed = session.info.setdefault("principal_changes", set())
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session: Session) -> None:
+    for user_id in session.info.pop("principal_changes", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session) -> None:
+    session.info.pop("principal_changes", None)
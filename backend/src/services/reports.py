@@ -0,0 +1,174 @@
+"""
+Streaming ticket report export
+
+Tickets are read through a server-side cursor (stream + yield_per) and
+serialized in batches, so an export of any date range holds one batch in
+memory. The optional per-technician summary is accumulated from the same
+pass over the rows rather than a second query.
+"""
+import csv
+import enum
+import io
+import json
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from ..database import AsyncSessionLocal
+from ..models import Ticket, TicketStatus, User
+from .stats import seconds_between
+
+EXPORT_BATCH_SIZE = 500
+
+TICKET_COLUMNS = [
+    "id", "created_at", "accepted_at", "completed_at", "status", "kategori", "sub_kategori",
+    "employee_nama", "employee_nip", "technician_id", "technician_nama",
+    "deskripsi", "resolution_notes",
+]
+SUMMARY_COLUMNS = [
+    "technician_id", "technician_nama", "total_tickets", "completed_tickets",
+    "completion_rate", "avg_resolution_seconds",
+]
+
+
+def _start_of(day: date) -> datetime:
+    return datetime.combine(day, time.min, timezone.utc)
+
+
+def _report_query(date_from: Optional[date], date_to: Optional[date]):
+    """Ticket rows with both parties' names, oldest first"""
+    employee = aliased(User)
+    technician = aliased(User)
+    query = (
+        select(
+            Ticket.id, Ticket.created_at, Ticket.accepted_at, Ticket.completed_at,
+            Ticket.status, Ticket.kategori, Ticket.sub_kategori,
+            employee.nama.label("employee_nama"), employee.nip.label("employee_nip"),
+            Ticket.technician_id, technician.nama.label("technician_nama"),
+            Ticket.deskripsi, Ticket.resolution_notes,
+        )
+        .join(employee, employee.id == Ticket.employee_id)
+        .outerjoin(technician, technician.id == Ticket.technician_id)
+        .order_by(Ticket.created_at, Ticket.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if date_from:
+        query = query.where(Ticket.created_at >= _start_of(date_from))
+    if date_to:
+        query = query.where(Ticket.created_at < _start_of(date_to + timedelta(days=1)))
+    return query
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+class TechnicianSummary:
+    """Per-technician totals accumulated while rows stream past"""
+
+    def __init__(self):
+        self._totals = defaultdict(lambda: {"nama": None, "total": 0, "completed": 0, "seconds": 0.0})
+
+    def add(self, row) -> None:
+        if row.technician_id is None:
+            return
+        totals = self._totals[row.technician_id]
+        totals["nama"] = row.technician_nama
+        totals["total"] += 1
+        if row.status == TicketStatus.COMPLETED:
+            totals["completed"] += 1
+            totals["seconds"] += seconds_between(row.accepted_at, row.completed_at)
+
+    def rows(self) -> list[dict]:
+        return [
+            {
+                "technician_id": technician_id,
+                "technician_nama": totals["nama"],
+                "total_tickets": totals["total"],
+                "completed_tickets": totals["completed"],
+                "completion_rate": round(totals["completed"] / totals["total"], 4),
+                "avg_resolution_seconds": (
+                    totals["seconds"] / totals["completed"] if totals["completed"] else None
+                ),
+            }
+            for technician_id, totals in sorted(self._totals.items(), key=lambda item: item[1]["nama"] or "")
+        ]
+
+
+async def _stream_batches(date_from: Optional[date], date_to: Optional[date]) -> AsyncIterator[list]:
+    # Own session: the request's session is closed before a streamed body is sent
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(_report_query(date_from, date_to))
+        async for batch in result.partitions():
+            yield batch
+
+
+async def export_csv(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_summary: bool = False
+) -> AsyncIterator[str]:
+    """
+    Yield a CSV export in chunks of EXPORT_BATCH_SIZE rows
+
+    With include_summary, a blank line and a per-technician summary
+    section follow the ticket rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    summary = TechnicianSummary()
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(TICKET_COLUMNS)
+    async for batch in _stream_batches(date_from, date_to):
+        for row in batch:
+            writer.writerow([_serialize(value) for value in row])
+            summary.add(row)
+        yield flush()
+
+    if include_summary:
+        writer.writerow([])
+        writer.writerow(SUMMARY_COLUMNS)
+        for entry in summary.rows():
+            writer.writerow([entry[column] for column in SUMMARY_COLUMNS])
+    yield flush()
+
+
+async def export_jsonl(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_summary: bool = False
+) -> AsyncIterator[str]:
+    """
+    Yield a JSON-lines export in chunks of EXPORT_BATCH_SIZE rows
+
+    Every line has a "record" key: "ticket" for ticket rows and, with
+    include_summary, "technician_summary" for the trailing summary lines.
+    """
+    summary = TechnicianSummary()
+    async for batch in _stream_batches(date_from, date_to):
+        lines = []
+        for row in batch:
+            record = {"record": "ticket"}
+            record.update((column, _serialize(value)) for column, value in zip(TICKET_COLUMNS, row))
+            lines.append(json.dumps(record, ensure_ascii=False))
+            summary.add(row)
+        yield "\n".join(lines) + "\n"
+
+    if include_summary:
+        lines = [
+            json.dumps({"record": "technician_summary", **entry}, ensure_ascii=False)
+            for entry in summary.rows()
+        ]
+        if lines:
+            yield "\n".join(lines) + "\n"
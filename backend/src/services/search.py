@@ -0,0 +1,153 @@
+"""
+Full-text search over ticket descriptions, resolution notes and comments
+
+The search document for each ticket lives in a `ticket_search` table that
+is created by alembic revision 0003 and maintained by the application
+whenever a ticket or its comments change. PostgreSQL stores a weighted
+tsvector with a GIN index; SQLite (local and test runs) uses an FTS5
+virtual table. Other databases fall back to ILIKE.
+"""
+import re
+from functools import lru_cache
+from sqlalchemy import text, select, literal, func, String, Float, Text
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..database import engine
+from ..models import Ticket
+
+settings = get_settings()
+
+SNIPPET_START = "<b>"
+SNIPPET_STOP = "</b>"
+
+
+class PostgresSearchBackend:
+    """tsvector + GIN index backend"""
+
+    def _upsert(self, where_clause: str) -> str:
+        return f"""
+            INSERT INTO ticket_search (ticket_id, document)
+            SELECT t.id,
+                   setweight(to_tsvector(CAST(:search_config AS regconfig), t.deskripsi), 'A')
+                   || setweight(to_tsvector(CAST(:search_config AS regconfig), coalesce(t.resolution_notes, '')), 'B')
+                   || setweight(to_tsvector(CAST(:search_config AS regconfig), coalesce(
+                        (SELECT string_agg(c.text, ' ') FROM comments c WHERE c.ticket_id = t.id), ''
+                      )), 'C')
+            FROM tickets t
+            {where_clause}
+            ON CONFLICT (ticket_id) DO UPDATE SET document = EXCLUDED.document
+        """
+
+    async def index_ticket(self, db: AsyncSession, ticket_id: str) -> None:
+        await db.execute(
+            text(self._upsert("WHERE t.id = :ticket_id")),
+            {"ticket_id": ticket_id, "search_config": settings.search_language}
+        )
+
+    def rebuild(self, connection) -> None:
+        # INSERT ... SELECT needs a WHERE before ON CONFLICT to parse unambiguously
+        connection.execute(
+            text(self._upsert("WHERE true")),
+            {"search_config": settings.search_language}
+        )
+
+    def match_ids(self, query_text: str):
+        return text(
+            "SELECT ticket_id FROM ticket_search "
+            "WHERE document @@ websearch_to_tsquery(CAST(:search_config AS regconfig), :search_query)"
+        ).bindparams(search_query=query_text, search_config=settings.search_language) \
+            .columns(ticket_id=String)
+
+    def ranked(self, query_text: str):
+        return text(f"""
+            SELECT s.ticket_id AS ticket_id,
+                   ts_rank(s.document, q.query) AS rank,
+                   ts_headline(
+                       CAST(:search_config AS regconfig),
+                       concat_ws(' ', t.deskripsi, t.resolution_notes),
+                       q.query,
+                       'StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, MaxWords=25, MinWords=8'
+                   ) AS snippet
+            FROM ticket_search s
+            JOIN tickets t ON t.id = s.ticket_id
+            CROSS JOIN websearch_to_tsquery(CAST(:search_config AS regconfig), :search_query) AS q(query)
+            WHERE s.document @@ q.query
+        """).bindparams(search_query=query_text, search_config=settings.search_language) \
+            .columns(ticket_id=String, rank=Float, snippet=Text).subquery("search_hits")
+
+
+class SqliteSearchBackend:
+    """FTS5 virtual table backend"""
+
+    _insert = """
+        INSERT INTO ticket_search (ticket_id, deskripsi, resolution_notes, comments)
+        SELECT t.id, t.deskripsi, coalesce(t.resolution_notes, ''),
+               coalesce((SELECT group_concat(c.text, ' ') FROM comments c WHERE c.ticket_id = t.id), '')
+        FROM tickets t
+    """
+
+    async def index_ticket(self, db: AsyncSession, ticket_id: str) -> None:
+        params = {"ticket_id": ticket_id}
+        await db.execute(text("DELETE FROM ticket_search WHERE ticket_id = :ticket_id"), params)
+        await db.execute(text(self._insert + " WHERE t.id = :ticket_id"), params)
+
+    def rebuild(self, connection) -> None:
+        connection.execute(text("DELETE FROM ticket_search"))
+        connection.execute(text(self._insert))
+
+    @staticmethod
+    def _fts_query(query_text: str) -> str:
+        """Quote each word as a prefix term so user input can't inject FTS syntax"""
+        words = re.findall(r"\w+", query_text, flags=re.UNICODE)
+        return " ".join(f'"{word}"*' for word in words) or '""'
+
+    def match_ids(self, query_text: str):
+        return text(
+            "SELECT ticket_id FROM ticket_search WHERE ticket_search MATCH :search_query"
+        ).bindparams(search_query=self._fts_query(query_text)).columns(ticket_id=String)
+
+    def ranked(self, query_text: str):
+        # bm25() is lower-is-better; negate it so every backend sorts rank DESC
+        return text(f"""
+            SELECT ticket_id,
+                   -bm25(ticket_search, 0.0, 10.0, 5.0, 1.0) AS rank,
+                   snippet(ticket_search, -1, '{SNIPPET_START}', '{SNIPPET_STOP}', '…', 16) AS snippet
+            FROM ticket_search
+            WHERE ticket_search MATCH :search_query
+        """).bindparams(search_query=self._fts_query(query_text)) \
+            .columns(ticket_id=String, rank=Float, snippet=Text).subquery("search_hits")
+
+
+class LikeSearchBackend:
+    """Unindexed fallback for databases without a full-text backend"""
+
+    async def index_ticket(self, db: AsyncSession, ticket_id: str) -> None:
+        pass
+
+    def rebuild(self, connection) -> None:
+        pass
+
+    def match_ids(self, query_text: str):
+        return select(Ticket.id).where(Ticket.deskripsi.ilike(f"%{query_text}%"))
+
+    def ranked(self, query_text: str):
+        return select(
+            Ticket.id.label("ticket_id"),
+            literal(1.0).label("rank"),
+            func.substr(Ticket.deskripsi, 1, 160).label("snippet")
+        ).where(Ticket.deskripsi.ilike(f"%{query_text}%")).subquery("search_hits")
+
+
+@lru_cache()
+def get_search_backend():
+    """Get the search backend matching the configured database"""
+    if engine.dialect.name == "postgresql":
+        return PostgresSearchBackend()
+    if engine.dialect.name == "sqlite":
+        return SqliteSearchBackend()
+    return LikeSearchBackend()
+
+
+async def index_ticket(db: AsyncSession, ticket_id: str) -> None:
+    """Refresh a ticket's search document inside the caller's transaction"""
+    await get_search_backend().index_ticket(db, ticket_id)
@@ -0,0 +1,172 @@
+"""
+Incrementally maintained technician statistics
+
+accept_ticket and complete_ticket add to the technician's row in
+technician_daily_stats (one per technician, day and category) inside the
+same transaction, so reading a technician's statistics aggregates at most
+days x categories rows however long their ticket history is.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Optional
+from sqlalchemy import select, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import engine
+from ..models import Ticket, TicketCategory, TechnicianDailyStats
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (SQLite, datetime.utcnow) as UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def seconds_between(start: Optional[datetime], end: Optional[datetime]) -> float:
+    """Non-negative seconds from start to end; 0 if either is missing"""
+    if start is None or end is None:
+        return 0.0
+    return max(0.0, (_as_utc(end) - _as_utc(start)).total_seconds())
+
+
+def _add_to_rollup(technician_id: str, day: date, kategori: TicketCategory, **increments):
+    """Build an upsert that adds increments to one rollup row"""
+    dialect_insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(TechnicianDailyStats).values(
+        technician_id=technician_id, day=day, kategori=kategori, **increments
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[
+            TechnicianDailyStats.technician_id,
+            TechnicianDailyStats.day,
+            TechnicianDailyStats.kategori,
+        ],
+        set_={
+            name: getattr(TechnicianDailyStats, name) + value
+            for name, value in increments.items()
+        }
+    )
+
+
+async def record_accept(db: AsyncSession, ticket: Ticket) -> None:
+    """Add an accepted ticket to its technician's rollup (caller commits)"""
+    await db.execute(_add_to_rollup(
+        ticket.technician_id, _as_utc(ticket.accepted_at).date(), ticket.kategori,
+        accepted_count=1,
+        response_seconds_sum=seconds_between(ticket.created_at, ticket.accepted_at)
+    ))
+
+
+async def record_complete(db: AsyncSession, ticket: Ticket) -> None:
+    """Add a completed ticket to its technician's rollup (caller commits)"""
+    await db.execute(_add_to_rollup(
+        ticket.technician_id, _as_utc(ticket.completed_at).date(), ticket.kategori,
+        completed_count=1,
+        resolution_seconds_sum=seconds_between(ticket.accepted_at, ticket.completed_at)
+    ))
+
+
+def _average(total: Optional[float], count: Optional[int]) -> Optional[float]:
+    return total / count if count else None
+
+
+async def get_technician_stats(
+    db: AsyncSession,
+    technician_id: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> dict:
+    """
+    Summarize a technician's rollup rows, overall and per category
+
+    Args:
+        db: Database session
+        technician_id: Technician ID
+        date_from: First day to include (inclusive)
+        date_to: Last day to include (inclusive)
+
+    Returns:
+        Dict matching TechnicianStatsResponse
+    """
+    query = (
+        select(
+            TechnicianDailyStats.kategori,
+            func.sum(TechnicianDailyStats.accepted_count).label("accepted_count"),
+            func.sum(TechnicianDailyStats.response_seconds_sum).label("response_seconds_sum"),
+            func.sum(TechnicianDailyStats.completed_count).label("completed_count"),
+            func.sum(TechnicianDailyStats.resolution_seconds_sum).label("resolution_seconds_sum"),
+        )
+        .where(TechnicianDailyStats.technician_id == technician_id)
+        .group_by(TechnicianDailyStats.kategori)
+        .order_by(TechnicianDailyStats.kategori)
+    )
+    if date_from:
+        query = query.where(TechnicianDailyStats.day >= date_from)
+    if date_to:
+        query = query.where(TechnicianDailyStats.day <= date_to)
+
+    rows = (await db.execute(query)).all()
+
+    categories = [
+        {
+            "kategori": row.kategori,
+            "accepted_count": row.accepted_count,
+            "completed_count": row.completed_count,
+            "avg_response_seconds": _average(row.response_seconds_sum, row.accepted_count),
+            "avg_resolution_seconds": _average(row.resolution_seconds_sum, row.completed_count),
+        }
+        for row in rows
+    ]
+    accepted = sum(row.accepted_count for row in rows)
+    completed = sum(row.completed_count for row in rows)
+    return {
+        "technician_id": technician_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "accepted_count": accepted,
+        "completed_count": completed,
+        "avg_response_seconds": _average(sum(row.response_seconds_sum for row in rows), accepted),
+        "avg_resolution_seconds": _average(sum(row.resolution_seconds_sum for row in rows), completed),
+        "categories": categories,
+    }
+
+
+def backfill_technician_stats(connection):
+    """
+    Fill the rollup from ticket history when it is empty
+
+    Run by scripts/seed_data.py after generating history, never at API
+    startup, so concurrent workers cannot insert the same keys. Alembic
+    revision 0003 runs a frozen copy for existing databases.
+    """
+    if connection.scalar(select(TechnicianDailyStats.technician_id).limit(1)) is not None:
+        return
+
+    totals = defaultdict(lambda: defaultdict(float))
+    rows = connection.execute(
+        select(
+            Ticket.technician_id, Ticket.kategori,
+            Ticket.created_at, Ticket.accepted_at, Ticket.completed_at
+        ).where(Ticket.technician_id.is_not(None), Ticket.accepted_at.is_not(None))
+    )
+    for row in rows:
+        accepted = totals[(row.technician_id, _as_utc(row.accepted_at).date(), row.kategori)]
+        accepted["accepted_count"] += 1
+        accepted["response_seconds_sum"] += seconds_between(row.created_at, row.accepted_at)
+        if row.completed_at is not None:
+            completed = totals[(row.technician_id, _as_utc(row.completed_at).date(), row.kategori)]
+            completed["completed_count"] += 1
+            completed["resolution_seconds_sum"] += seconds_between(row.accepted_at, row.completed_at)
+
+    if totals:
+        connection.execute(insert(TechnicianDailyStats), [
+            {
+                "technician_id": technician_id,
+                "day": day,
+                "kategori": kategori,
+                "accepted_count": int(values["accepted_count"]),
+                "response_seconds_sum": values["response_seconds_sum"],
+                "completed_count": int(values["completed_count"]),
+                "resolution_seconds_sum": values["resolution_seconds_sum"],
+            }
+            for (technician_id, day, kategori), values in totals.items()
+        ])
@@ -0,0 +1,101 @@
+"""
+Ticket query helpers shared by ticket routes
+"""
+from typing import Optional
+from sqlalchemy import select, update, func, case, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from ..models import Ticket, TicketStatus, Comment
+from .principals import Principal
+
+# Eager-load both parties so names come from the same SELECT as the tickets
+TICKET_LOAD_OPTIONS = (
+    joinedload(Ticket.employee),
+    joinedload(Ticket.technician),
+)
+
+
+def scope_to_user(query, user: Principal):
+    """Restrict a ticket query to the tickets the user may see"""
+    if user.role == "employee":
+        return query.filter(Ticket.employee_id == user.id)
+    if user.role == "technician":
+        return query.filter(Ticket.technician_id == user.id)
+    return query
+
+
+async def hydrate_tickets(db: AsyncSession, tickets: list[Ticket], viewer_id: str) -> list[Ticket]:
+    """
+    Fill the computed TicketResponse fields on a page of tickets
+
+    Names are read from the eager-loaded relationships; comment counts come
+    from a single grouped query over the page, so a page costs a fixed
+    number of round trips regardless of its size.
+
+    Args:
+        db: Database session
+        tickets: Tickets loaded with TICKET_LOAD_OPTIONS
+        viewer_id: Current user ID (their own comments never count as unread)
+
+    Returns:
+        The same tickets, with extra attributes set
+    """
+    counts = {}
+    if tickets:
+        rows = await db.execute(select(
+            Comment.ticket_id,
+            func.count(Comment.id),
+            func.sum(case(
+                (and_(Comment.is_read == False, Comment.user_id != viewer_id), 1),
+                else_=0
+            ))
+        ).where(
+            Comment.ticket_id.in_([ticket.id for ticket in tickets])
+        ).group_by(Comment.ticket_id))
+        counts = {ticket_id: (total, unread or 0) for ticket_id, total, unread in rows}
+    
+    for ticket in tickets:
+        ticket.employee_nama = ticket.employee.nama if ticket.employee else None
+        ticket.employee_nip = ticket.employee.nip if ticket.employee else None
+        ticket.technician_nama = ticket.technician.nama if ticket.technician else None
+        ticket.comment_count, ticket.unread_comments = counts.get(ticket.id, (0, 0))
+    
+    return tickets
+
+
+async def transition_ticket(
+    db: AsyncSession,
+    ticket_id: str,
+    technician_id: str,
+    expected: TicketStatus,
+    **values
+) -> Optional[Ticket]:
+    """
+    Change a ticket in one conditional UPDATE ... RETURNING
+    
+    The WHERE clause checks the assignment and the current status in the
+    same statement that writes, so of two concurrent transitions exactly
+    one matches the row. The returned ticket carries its columns only;
+    callers that respond with it load the employee and technician with
+    one more SELECT using TICKET_LOAD_OPTIONS.
+    
+    Args:
+        db: Database session (caller commits)
+        ticket_id: Ticket ID
+        technician_id: Technician who must be assigned to the ticket
+        expected: Status the ticket must currently have
+        **values: Columns to set
+    
+    Returns:
+        The updated ticket, or None if no ticket matched all conditions
+    """
+    return await db.scalar(
+        update(Ticket)
+        .where(
+            Ticket.id == ticket_id,
+            Ticket.technician_id == technician_id,
+            Ticket.status == expected
+        )
+        .values(**values)
+        .returning(Ticket)
+    )
@@ -0,0 +1,262 @@
+"""
+Bulk employee/technician/admin import from CSV (FR-006)
+
+Rows are validated up front, every new password is hashed across a
+process pool, then users are upserted keyed on username in batches with
+one executemany per batch. A NIP that already belongs to a different
+username is reported as a row error instead of aborting the batch.
+
+CSV columns (header required): username, nama, role, password, nip,
+region, wilayah, categories, sub_categories, nomor_wa, permissions.
+List columns use ";" as separator. password may be left empty to keep
+an existing user's password.
+"""
+import asyncio
+import csv
+import io
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import select, delete, insert, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import get_settings
+from ..database import engine
+from ..models import (
+    User, UserRole, TicketCategory, TechnicianCategory, TechnicianSubCategory, AdminPermission
+)
+from ..utils.auth import hash_passwords
+from ..utils.executor import BoundedExecutor
+from ..utils.regions import normalize_region
+from .principals import principal_cache
+from .matching import technician_index
+
+settings = get_settings()
+
+LIST_SEPARATOR = ";"
+USER_COLUMNS = ("nama", "role", "nip", "region", "wilayah", "nomor_wa")
+LINK_TABLES = {
+    "categories": (TechnicianCategory, "category"),
+    "sub_categories": (TechnicianSubCategory, "sub_category"),
+    "permissions": (AdminPermission, "permission"),
+}
+CATEGORY_VALUES = {category.value for category in TicketCategory}
+
+# Separate from the login pool so an import can't starve interactive logins
+import_hash_pool = BoundedExecutor(
+    "bulk-bcrypt",
+    workers=settings.bulk_import_hash_workers or os.cpu_count() or 1,
+    kind="process"
+)
+
+
+@dataclass
+class ImportRowError:
+    """A rejected CSV row"""
+    line: int
+    username: Optional[str]
+    error: str
+
+
+@dataclass
+class ImportResult:
+    """Outcome of an import"""
+    created: int = 0
+    updated: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+
+@dataclass
+class _Row:
+    line: int
+    username: str
+    password: Optional[str]
+    values: dict
+    links: dict[str, list[str]]
+    user_id: Optional[str] = None
+    hashed_password: Optional[str] = None
+
+
+def _split(raw: Optional[str]) -> list[str]:
+    return sorted({value.strip() for value in (raw or "").split(LIST_SEPARATOR) if value.strip()})
+
+
+def _parse_row(line: int, record: dict) -> _Row:
+    """Validate one CSV record; raises ValueError with an Indonesian message"""
+    record = {key.strip().lower(): (value or "").strip() for key, value in record.items() if key}
+    username = record.get("username", "")
+    if len(username) < 3:
+        raise ValueError("Username minimal 3 karakter")
+    if not record.get("nama"):
+        raise ValueError("Nama wajib diisi")
+    try:
+        role = UserRole(record.get("role", "").lower())
+    except ValueError:
+        raise ValueError(f"Role tidak valid: {record.get('role')!r}") from None
+
+    password = record.get("password") or None
+    if password is not None and len(password) < 6:
+        raise ValueError("Password minimal 6 karakter")
+    if role == UserRole.EMPLOYEE and not record.get("nip"):
+        raise ValueError("NIP wajib diisi untuk employee")
+
+    links = {name: _split(record.get(name)) for name in LINK_TABLES}
+    unknown = set(links["categories"]) - CATEGORY_VALUES
+    if unknown:
+        raise ValueError(f"Kategori tidak valid: {', '.join(sorted(unknown))}")
+
+    values = {column: record.get(column) or None for column in USER_COLUMNS}
+    values["role"] = role
+    values["wilayah_key"] = normalize_region(values["wilayah"])
+    return _Row(line=line, username=username, password=password, values=values, links=links)
+
+
+def parse_csv(text: str) -> tuple[list[_Row], list[ImportRowError]]:
+    """Parse and validate every row, rejecting duplicates within the file"""
+    rows, errors = [], []
+    seen_usernames, seen_nips = set(), set()
+    # Line 1 is the header
+    for line, record in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        try:
+            row = _parse_row(line, record)
+            if row.username in seen_usernames:
+                raise ValueError("Username duplikat dalam file")
+            nip = row.values["nip"]
+            if nip and nip in seen_nips:
+                raise ValueError("NIP duplikat dalam file")
+        except ValueError as e:
+            errors.append(ImportRowError(line=line, username=(record.get("username") or None), error=str(e)))
+            continue
+        seen_usernames.add(row.username)
+        if nip:
+            seen_nips.add(nip)
+        rows.append(row)
+    return rows, errors
+
+
+async def _hash_all(rows: list[_Row]) -> None:
+    """Hash new passwords in parallel chunks across the process pool"""
+    pending = [row for row in rows if row.password is not None]
+    if not pending:
+        return
+    chunk_size = max(1, len(pending) // (import_hash_pool.workers * 4))
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    results = await asyncio.gather(*[
+        import_hash_pool.run(hash_passwords, [row.password for row in chunk])
+        for chunk in chunks
+    ])
+    for chunk, hashes in zip(chunks, results):
+        for row, hashed in zip(chunk, hashes):
+            row.hashed_password = hashed
+
+
+async def _resolve_existing(db: AsyncSession, rows: list[_Row], result: ImportResult) -> list[_Row]:
+    """Attach existing user IDs and drop rows that conflict with other users"""
+    nips = [row.values["nip"] for row in rows if row.values["nip"]]
+    existing = (await db.execute(
+        select(User.id, User.username, User.nip)
+        .where(or_(User.username.in_([row.username for row in rows]), User.nip.in_(nips)))
+    )).all()
+    id_by_username = {user.username: user.id for user in existing}
+    username_by_nip = {user.nip: user.username for user in existing if user.nip}
+
+    accepted = []
+    for row in rows:
+        owner = username_by_nip.get(row.values["nip"])
+        if owner is not None and owner != row.username:
+            result.errors.append(ImportRowError(row.line, row.username, f"NIP sudah dipakai oleh {owner}"))
+            continue
+        row.user_id = id_by_username.get(row.username)
+        if row.user_id is None and row.password is None:
+            result.errors.append(ImportRowError(row.line, row.username, "Password wajib diisi untuk user baru"))
+            continue
+        accepted.append(row)
+    return accepted
+
+
+def _upsert(columns: list[str]):
+    """Build an upsert on username that updates the given columns"""
+    dialect_insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+    statement = dialect_insert(User)
+    return statement.on_conflict_do_update(
+        index_elements=[User.username],
+        set_={column: statement.excluded[column] for column in columns}
+    )
+
+
+async def _write_batch(db: AsyncSession, rows: list[_Row]) -> None:
+    """Upsert one batch of users and replace their skill/permission links"""
+    now = datetime.now(timezone.utc)
+    columns = [*USER_COLUMNS, "wilayah_key", "updated_at"]
+
+    # Rows without a password keep their stored hash, so they get their own statement
+    for with_password in (True, False):
+        group = [row for row in rows if (row.hashed_password is not None) == with_password]
+        if not group:
+            continue
+        parameters = []
+        for row in group:
+            parameters.append({
+                "id": row.user_id or str(uuid.uuid4()),
+                "username": row.username,
+                "hashed_password": row.hashed_password or "",
+                "is_active": True,
+                "updated_at": now,
+                **row.values,
+            })
+            row.user_id = parameters[-1]["id"]
+        await db.execute(
+            _upsert(columns + ["hashed_password"] if with_password else columns),
+            parameters
+        )
+
+    user_ids = [row.user_id for row in rows]
+    for name, (model, column) in LINK_TABLES.items():
+        await db.execute(delete(model).where(model.user_id.in_(user_ids)))
+        links = [{"user_id": row.user_id, column: value} for row in rows for value in row.links[name]]
+        if links:
+            await db.execute(insert(model), links)
+
+
+async def import_users(db: AsyncSession, text: str, batch_size: Optional[int] = None) -> ImportResult:
+    """
+    Import users from CSV text, committing once per batch
+
+    Args:
+        db: Database session
+        text: CSV content with a header row
+        batch_size: Rows per upsert/commit (defaults to the configured size)
+
+    Returns:
+        Created/updated counts and per-row errors
+    """
+    batch_size = batch_size or settings.bulk_import_batch_size
+    rows, errors = parse_csv(text)
+    result = ImportResult(errors=errors)
+
+    resolved = []
+    for start in range(0, len(rows), batch_size):
+        resolved.extend(await _resolve_existing(db, rows[start:start + batch_size], result))
+    await _hash_all(resolved)
+
+    for start in range(0, len(resolved), batch_size):
+        batch = resolved[start:start + batch_size]
+        existing_ids = [row.user_id for row in batch if row.user_id]
+        await _write_batch(db, batch)
+        await db.commit()
+
+        # Core upserts bypass the ORM events that normally keep these in sync
+        for user_id in existing_ids:
+            principal_cache.invalidate(user_id)
+        technician_index.invalidate(
+            row.user_id for row in batch
+            if row.values["role"] == UserRole.TECHNICIAN or row.user_id in technician_index.entries
+        )
+
+        result.updated += len(existing_ids)
+        result.created += len(batch) - len(existing_ids)
+
+    result.errors.sort(key=lambda error: error.line)
+    return result
@@ -0,0 +1,147 @@
+"""
+Worker warm-up and readiness
+
+A freshly started worker has no open connections, empty in-process
+indexes, no compiled SQL and no spawned hashing threads, so the first
+requests it serves pay for all of that. warm_up() does the work during
+startup instead, and the worker only reports ready at /api/ready once it
+has finished; a load balancer polling that probe keeps traffic on the
+old workers during a rolling restart until the new ones are warm.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select, text
+from sqlalchemy.orm import joinedload
+from ..config import get_settings
+from ..database import async_engine, AsyncSessionLocal, pool_state
+from ..models import Ticket, Comment
+from ..utils.auth import password_pool
+from .assignment import load_queue
+from .matching import technician_index
+from .notifications import get_unread_count
+from .principals import get_principal
+from .tickets import TICKET_LOAD_OPTIONS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Matches no row; only the statement's shape matters for the compiled cache
+_NO_ID = ""
+
+
+@dataclass
+class WorkerState:
+    """Whether this worker should receive traffic"""
+    ready: bool = False
+    warmup_seconds: Optional[float] = None
+
+
+worker_state = WorkerState()
+
+
+async def warm_pool(connections: int) -> int:
+    """
+    Open up to `connections` request-pool connections at once and return them to the pool
+
+    Returns:
+        Number of connections opened
+    """
+    if connections <= 0:
+        return 0
+    # Each connection is held until all are open, so the pool grows instead of reusing one
+    barrier = asyncio.Barrier(connections)
+    opened = 0
+
+    async def open_one():
+        nonlocal opened
+        try:
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+                opened += 1
+                await barrier.wait()
+        except Exception:
+            await barrier.abort()
+            raise
+
+    await asyncio.gather(*[open_one() for _ in range(connections)], return_exceptions=True)
+    return opened
+
+
+async def warm_statements() -> None:
+    """
+    Compile the statements of the hot read paths and load the in-process indexes
+
+    Runs each query with an id that matches nothing, so SQLAlchemy's
+    compiled cache and the driver are primed without touching real rows.
+    """
+    async with AsyncSessionLocal() as db:
+        await get_principal(db, _NO_ID)
+        await get_unread_count(db, _NO_ID)
+        await db.scalar(select(Ticket).options(*TICKET_LOAD_OPTIONS).where(Ticket.id == _NO_ID))
+        await db.scalars(
+            select(Comment).options(joinedload(Comment.user))
+            .where(Comment.ticket_id == _NO_ID)
+            .order_by(Comment.created_at, Comment.id)
+        )
+        await technician_index.ensure_loaded(db)
+        await load_queue.ensure_synced(db)
+
+
+async def warm_up(app) -> None:
+    """
+    Prepare the worker for traffic, then mark it ready
+
+    A failed step is logged and skipped: a partly warm worker still
+    serves correctly, just slower for its first requests.
+    """
+    started = time.perf_counter()
+    steps = (
+        ("connection pool", warm_pool(settings.warmup_pool_connections)),
+        ("statements", warm_statements()),
+        ("password hashing pool", password_pool.warm()),
+    )
+    for name, step in steps:
+        try:
+            await step
+        except Exception:
+            logger.exception("Warm-up step failed: %s", name)
+    # FastAPI builds the OpenAPI schema on the first /docs or /openapi.json hit
+    app.openapi()
+
+    worker_state.warmup_seconds = round(time.perf_counter() - started, 3)
+    worker_state.ready = True
+    logger.info("Worker ready", extra={"warmup_seconds": worker_state.warmup_seconds})
+
+
+async def check_readiness() -> tuple[bool, dict]:
+    """
+    Whether this worker should receive traffic, with the result of each check
+
+    Ready means warm-up has finished and the worker is not shutting
+    down, the database answers within ready_timeout_seconds, and the
+    request pool is below ready_max_pool_utilization (an exhausted pool
+    also fails the database check, since it cannot hand out a connection
+    in time).
+    """
+    checks = {"warmed_up": worker_state.ready}
+    ready = worker_state.ready
+
+    try:
+        async with asyncio.timeout(settings.ready_timeout_seconds):
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except Exception as e:
+        checks["database"] = f"unreachable: {type(e).__name__}"
+        ready = False
+
+    utilization = pool_state().get("utilization")
+    if utilization is not None:
+        checks["pool_utilization"] = round(utilization, 3)
+        if utilization > settings.ready_max_pool_utilization:
+            ready = False
+
+    return ready, checks
@@ -6,26 +6,60 @@ from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
 from ..config import get_settings
+from .executor import BoundedExecutor
 
 settings = get_settings()
 
+# bcrypt is CPU-bound; async routes hash and verify on this pool
+password_pool = BoundedExecutor(
+    "bcrypt",
+    workers=settings.password_hash_workers,
+    kind=settings.password_hash_executor,
+    max_queue=settings.password_hash_max_queue
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
+    # Bcrypt has a 72 byte limit - truncate the same way as when hashing
     return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
+        plain_password.encode('utf-8')[:72],
         hashed_password.encode('utf-8')
     )
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt at the configured cost"""
     # Bcrypt has a 72 byte limit - truncate if needed
     password_bytes = password.encode('utf-8')[:72]
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
+    hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+def hash_passwords(passwords: list[str], rounds: Optional[int] = None) -> list[str]:
+    """Hash a batch of passwords (module-level so process pools can pickle it)"""
+    return [get_password_hash(password, rounds) for password in passwords]
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with a different cost than configured"""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt worker pool"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt worker pool"""
+    return await password_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
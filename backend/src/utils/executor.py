@@ -0,0 +1,143 @@
+"""
+Bounded worker pools for CPU-heavy work called from async routes
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Optional
+from .metrics import registry
+
+# Every pool created in this process, exported at /api/metrics
+_executors: list["BoundedExecutor"] = []
+
+wait_seconds = registry.histogram(
+    "worker_pool_wait_seconds",
+    "Time calls spent queued for a free worker",
+    ("pool",)
+)
+run_seconds = registry.histogram(
+    "worker_pool_run_seconds",
+    "Time calls spent running on a worker",
+    ("pool",)
+)
+
+
+def _noop() -> None:
+    pass
+
+
+class ExecutorBusy(Exception):
+    """Raised when a pool's wait queue is full"""
+
+
+class BoundedExecutor:
+    """
+    Run blocking functions off the event loop with a concurrency cap
+
+    At most `workers` calls run at once; further callers wait in a queue
+    of at most `max_queue` entries (0 for unbounded) and are rejected with
+    ExecutorBusy beyond that, so a burst sheds load instead of piling up.
+    """
+
+    def __init__(self, name: str, workers: int, kind: str = "thread", max_queue: int = 0):
+        self.name = name
+        self.workers = max(1, workers)
+        self.kind = kind
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Metrics
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_waiting = 0
+        _executors.append(self)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=self.name
+                )
+        return self._executor
+
+    async def run(self, fn: Callable, *args):
+        """
+        Run fn(*args) on the pool
+
+        Raises:
+            ExecutorBusy: If the wait queue is full
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        if self.max_queue and self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorBusy(f"{self.name} pool is saturated")
+
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.perf_counter()
+        wait_seconds.observe(started - queued_at, pool=self.name)
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            run_seconds.observe(time.perf_counter() - started, pool=self.name)
+            self.running -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def warm(self) -> None:
+        """Start every worker now rather than on the first calls (processes take a while to spawn)"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*[loop.run_in_executor(executor, _noop) for _ in range(self.workers)])
+
+    def stats(self) -> dict:
+        """Current queue depth and throughput counters"""
+        return {
+            "workers": self.workers,
+            "kind": self.kind,
+            "running": self.running,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._semaphore = None
+
+
+def _executor_collector(field: str):
+    def collect() -> dict:
+        return {(executor.name,): getattr(executor, field) for executor in _executors}
+    return collect
+
+
+registry.gauge("worker_pool_workers", "Worker cap per pool", ("pool",), collect=_executor_collector("workers"))
+registry.gauge("worker_pool_running", "Calls currently running per pool", ("pool",), collect=_executor_collector("running"))
+registry.gauge("worker_pool_waiting", "Calls currently queued per pool", ("pool",), collect=_executor_collector("waiting"))
+registry.counter(
+    "worker_pool_completed_total", "Calls finished per pool", ("pool",), collect=_executor_collector("completed")
+)
+registry.counter(
+    "worker_pool_rejected_total", "Calls rejected because the queue was full", ("pool",),
+    collect=_executor_collector("rejected")
+)
@@ -0,0 +1,131 @@
+"""
+Structured, non-blocking logging
+
+Handlers on the request path only put records on a queue; a
+QueueListener thread formats them (JSON by default) and writes them to
+stdout, so slow log I/O never stalls the event loop. Every record is
+tagged with the request id and user id of the request that produced it.
+"""
+import copy
+import logging
+import queue
+import sys
+from contextvars import ContextVar
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from pythonjsonlogger import jsonlogger
+from .metrics import registry
+
+dropped_records_total = registry.counter(
+    "log_records_dropped_total",
+    "Log records discarded because the log queue was full"
+)
+
+
+@dataclass
+class RequestContext:
+    """Identifiers attached to every record logged while serving a request"""
+    request_id: str
+    user_id: Optional[str] = None
+    # Epoch seconds of the client's last write, for read-your-writes routing (not logged)
+    last_write: Optional[float] = None
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+_listener: Optional[QueueListener] = None
+
+
+def bind_request(request_id: str):
+    """Start tagging records with a request id; returns a token for reset_request"""
+    return _request_context.set(RequestContext(request_id=request_id))
+
+
+def reset_request(token) -> None:
+    _request_context.reset(token)
+
+
+def set_log_user(user_id: str) -> None:
+    """Record the authenticated user on the current request's context"""
+    context = _request_context.get()
+    if context is not None:
+        context.user_id = user_id
+
+
+def current_request() -> Optional[RequestContext]:
+    return _request_context.get()
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the request identifiers onto the record (runs on the caller's thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        record.request_id = context.request_id if context else None
+        record.user_id = context.user_id if context else None
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of waiting when the queue is full"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now but keep the traceback as text for the JSON formatter
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records_total.inc()
+
+
+def configure_logging(level: str = "INFO", json_format: bool = True, queue_size: int = 10000) -> None:
+    """
+    Route the root logger (and uvicorn's loggers) through the log queue
+
+    uvicorn's own access log is disabled; RequestLogMiddleware writes a
+    structured access record instead.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if json_format:
+        output.setFormatter(jsonlogger.JsonFormatter(
+            "%(levelname)s %(name)s %(message)s",
+            rename_fields={"levelname": "level", "name": "logger"},
+            timestamp=True
+        ))
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level.upper())
+    for name in ("uvicorn", "uvicorn.error"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    logging.getLogger("uvicorn.access").disabled = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
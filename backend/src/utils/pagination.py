@@ -0,0 +1,66 @@
+"""
+Pagination utilities for keyset (cursor) pagination
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """
+    Encode an opaque cursor from the last row of a page
+
+    Args:
+        created_at: Sort timestamp of the last row
+        row_id: Primary key of the last row (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode an opaque cursor back into its (created_at, id) position
+
+    Args:
+        cursor: Cursor string produced by encode_cursor
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        ValueError: If cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Cursor tidak valid") from e
+
+
+def keyset_before(created_at_column, id_column, created_at: datetime, row_id: str):
+    """
+    Build the WHERE clause for the page after a cursor in
+    ORDER BY created_at DESC, id DESC
+    """
+    return or_(
+        created_at_column < created_at,
+        and_(created_at_column == created_at, id_column < row_id)
+    )
+
+
+
+def keyset_after(created_at_column, id_column, created_at, row_id):
+    """
+    Build the WHERE clause for the page after a cursor in
+    ORDER BY created_at ASC, id ASC
+    """
+    return or_(
+        created_at_column > created_at,
+        and_(created_at_column == created_at, id_column > row_id)
+    )
@@ -0,0 +1,21 @@
+"""
+Region name normalization shared by storage and lookups
+"""
+from typing import Optional
+
+
+def normalize_region(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a region name or client enum name to a lookup key
+    
+    "UPT Malang", "uptMalang" and "malang" all map to "malang";
+    "ALL UIT" and empty values map to None (no region constraint).
+    """
+    if not value:
+        return None
+    key = value.lower().replace(" ", "").replace("_", "")
+    if key == "alluit":
+        return None
+    if key.startswith("kantorinduk"):
+        return "kantorinduk"
+    return key.removeprefix("upt")
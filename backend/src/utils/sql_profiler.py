@@ -0,0 +1,104 @@
+"""
+Per-request SQL profiling
+
+Cursor execution events attribute every statement's count and duration
+to the profile of the request being served (a context variable set by
+QueryProfileMiddleware). Identical statement text repeated within one
+request is the signature of an N+1 loop, since only the bound parameters
+differ between iterations. Statements slower than the configured
+threshold are written to the "sql.slow" logger whether or not a request
+is being profiled.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .metrics import registry
+
+slow_query_logger = logging.getLogger("sql.slow")
+
+query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+slow_queries_total = registry.counter("db_slow_queries_total", "Statements slower than slow_query_ms")
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed while serving one request"""
+    count: int = 0
+    seconds: float = 0.0
+    # Statement text -> [executions, total seconds]
+    statements: dict[str, list] = field(default_factory=dict)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        totals = self.statements.setdefault(statement, [0, 0.0])
+        totals[0] += 1
+        totals[1] += elapsed
+
+    def repeated(self, threshold: int) -> list[tuple[str, int, float]]:
+        """Statements executed at least `threshold` times, most frequent first"""
+        if threshold <= 0:
+            return []
+        found = [
+            (statement, executions, seconds)
+            for statement, (executions, seconds) in self.statements.items()
+            if executions >= threshold
+        ]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+def start_profile():
+    """Begin attributing statements to a new profile; returns (profile, token)"""
+    profile = QueryProfile()
+    return profile, _current_profile.set(profile)
+
+
+def stop_profile(token) -> None:
+    _current_profile.reset(token)
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+def install_query_profiler(engine: Engine, slow_query_ms: int) -> None:
+    """Register the timing hooks on a (sync) engine"""
+    slow_seconds = slow_query_ms / 1000 if slow_query_ms > 0 else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        elapsed = time.perf_counter() - started
+        query_duration_seconds.observe(elapsed)
+
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+
+        if slow_seconds is not None and elapsed >= slow_seconds:
+            slow_queries_total.inc()
+            slow_query_logger.warning(
+                "Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split()),
+                extra={"duration_ms": round(elapsed * 1000, 1), "statement": statement}
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(exception_context):
+        # after_cursor_execute doesn't fire for failed statements
+        timers = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+        if timers:
+            timers.pop()
@@ -0,0 +1,88 @@
+"""
+Shared test setup
+
+Settings are read when src.database is first imported, so the environment
+points at a throwaway SQLite primary before any test module imports src.
+"""
+import os
+import sys
+import tempfile
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TEST_DB_DIR = Path(tempfile.mkdtemp(prefix="pln-ticket-tests-"))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_DIR / 'primary.db'}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["DEBUG"] = "false"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+
+
+@dataclass
+class TestUser:
+    """A user created for one test, with the headers of a logged-in client"""
+    __test__ = False
+
+    id: str
+    headers: dict
+
+
+@pytest.fixture(scope="session")
+def schema():
+    """Migrate the test primary to head once per run"""
+    from src.database import init_db
+    init_db()
+
+
+@pytest.fixture
+def make_user(schema):
+    """
+    Create users directly in the database and sign tokens for them
+
+    Usernames are unique per call, so tests share the database without
+    seeing each other's users. Technicians always get a wilayah: a
+    central technician would be eligible for every other test's tickets.
+    """
+    from src.database import SessionLocal
+    from src.models import User, UserRole
+    from src.utils.auth import create_access_token
+
+    def make(role: UserRole, region: Optional[str] = None, categories: tuple = (), **fields) -> TestUser:
+        suffix = uuid.uuid4().hex[:8]
+        user_id = str(uuid.uuid4())
+        user = User(
+            id=user_id,
+            username=f"{role.value}-{suffix}",
+            hashed_password="unused",
+            nama=f"{role.value.title()} {suffix}",
+            role=role,
+            **fields
+        )
+        if role == UserRole.EMPLOYEE:
+            user.nip = suffix
+            user.region = region
+        elif role == UserRole.TECHNICIAN:
+            user.wilayah = region or f"UPT Test {suffix}"
+            user.categories = list(categories)
+        with SessionLocal() as db:
+            db.add(user)
+            db.commit()
+        token = create_access_token(data={"sub": user_id, "role": role})
+        return TestUser(id=user_id, headers={"Authorization": f"Bearer {token}"})
+
+    return make
+
+
+@pytest_asyncio.fixture
+async def api(schema):
+    """HTTP client for the application, without its startup hooks"""
+    from src.main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
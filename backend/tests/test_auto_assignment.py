@@ -0,0 +1,56 @@
+"""
+Automatic assignment to the least-loaded eligible technician
+"""
+import asyncio
+import uuid
+import pytest
+from sqlalchemy import func, select
+from src.database import SessionLocal
+from src.models import Ticket, TicketStatus, User, UserRole
+
+OPEN = (TicketStatus.PENDING, TicketStatus.IN_PROGRESS)
+
+
+def _open_tickets(technician_ids: list[str]) -> dict[str, int]:
+    with SessionLocal() as db:
+        counts = dict(db.execute(
+            select(Ticket.technician_id, func.count())
+            .where(Ticket.technician_id.in_(technician_ids), Ticket.status.in_(OPEN))
+            .group_by(Ticket.technician_id)
+        ).all())
+        counters = dict(db.execute(
+            select(User.id, User.assigned_tickets_count).where(User.id.in_(technician_ids))
+        ).all())
+    assert counters == {technician_id: counts.get(technician_id, 0) for technician_id in technician_ids}
+    return {technician_id: counts.get(technician_id, 0) for technician_id in technician_ids}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_go_to_the_least_loaded_eligible_technician(api, make_user):
+    region = f"UPT Uji {uuid.uuid4().hex[:8]}"
+    employee = make_user(UserRole.EMPLOYEE, region=region)
+    busy, idle, half = (make_user(UserRole.TECHNICIAN, region=region, categories=("aplikasi",)) for _ in range(3))
+    wrong_skill = make_user(UserRole.TECHNICIAN, region=region, categories=("zoom",))
+    wrong_region = make_user(UserRole.TECHNICIAN, categories=("aplikasi",))
+    unavailable = make_user(UserRole.TECHNICIAN, region=region, categories=("aplikasi",), is_available=False)
+    technicians = [busy.id, idle.id, half.id, wrong_skill.id, wrong_region.id, unavailable.id]
+
+    async def create(technician_id=None):
+        response = await api.post("/api/tickets", headers=employee.headers, json={
+            "deskripsi": "Aplikasi absensi error saat login", "kategori": "aplikasi",
+            **({"technician_id": technician_id} if technician_id else {})
+        })
+        assert response.status_code == 201, response.text
+        return response.json()["technician_id"]
+
+    for technician_id in (busy.id, busy.id, half.id):
+        await create(technician_id)
+    assert _open_tickets(technicians)[busy.id] == 2
+
+    assigned = await asyncio.gather(*[create() for _ in range(6)])
+
+    assert set(assigned) <= {busy.id, idle.id, half.id}
+    # 3 existing + 6 new open tickets spread evenly over the three eligible technicians
+    loads = _open_tickets(technicians)
+    assert [loads[technician.id] for technician in (busy, idle, half)] == [3, 3, 3]
+    assert loads[wrong_skill.id] == loads[wrong_region.id] == loads[unavailable.id] == 0
@@ -0,0 +1,47 @@
+"""
+Incremental comment fetch with `since`
+"""
+import pytest
+from src.models import UserRole
+
+
+async def _ticket(api, employee, technician) -> str:
+    response = await api.post("/api/tickets", headers=employee.headers, json={
+        "deskripsi": "Printer lantai dua macet", "kategori": "hardware", "technician_id": technician.id
+    })
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_since_comment_id_returns_only_newer_comments(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("hardware",))
+    ticket_id = await _ticket(api, employee, technician)
+    url = f"/api/tickets/{ticket_id}/comments"
+
+    ids = [
+        (await api.post(url, headers=employee.headers, json={"text": f"Komentar {n}"})).json()["id"]
+        for n in range(3)
+    ]
+
+    delta = await api.get(url, headers=technician.headers, params={"since": ids[0]})
+    assert [comment["id"] for comment in delta.json()["comments"]] == ids[1:]
+    latest = await api.get(url, headers=technician.headers, params={"since": ids[-1]})
+    assert latest.status_code == 200
+    assert latest.json()["comments"] == []
+
+
+@pytest.mark.asyncio
+async def test_since_rejects_ids_that_are_not_on_the_ticket(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("hardware",))
+    ticket_id = await _ticket(api, employee, technician)
+    other_ticket_id = await _ticket(api, employee, technician)
+    other_comment = (await api.post(
+        f"/api/tickets/{other_ticket_id}/comments", headers=employee.headers, json={"text": "Di tiket lain"}
+    )).json()["id"]
+
+    url = f"/api/tickets/{ticket_id}/comments"
+    for since in ("no-such-comment", other_comment):
+        response = await api.get(url, headers=employee.headers, params={"since": since})
+        assert response.status_code == 400
@@ -0,0 +1,55 @@
+"""
+ETag / If-None-Match on the ticket list, ticket detail and comments
+"""
+import pytest
+from src.models import UserRole
+
+
+async def _revalidate(api, user, url: str, etag: str):
+    return await api.get(url, headers={**user.headers, "If-None-Match": etag})
+
+
+@pytest.mark.asyncio
+async def test_unchanged_responses_are_not_modified(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("jaringanKoneksi",))
+    ticket_id = (await api.post("/api/tickets", headers=employee.headers, json={
+        "deskripsi": "Wifi ruang rapat putus", "kategori": "jaringanKoneksi", "technician_id": technician.id
+    })).json()["id"]
+
+    for url in ("/api/tickets", f"/api/tickets/{ticket_id}", f"/api/tickets/{ticket_id}/comments"):
+        first = await api.get(url, headers=employee.headers)
+        etag = first.headers["etag"]
+        again = await _revalidate(api, employee, url, etag)
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+
+@pytest.mark.asyncio
+async def test_comment_and_transitions_change_the_etag(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("jaringanKoneksi",))
+    ticket_id = (await api.post("/api/tickets", headers=employee.headers, json={
+        "deskripsi": "VPN kantor tidak tersambung", "kategori": "jaringanKoneksi", "technician_id": technician.id
+    })).json()["id"]
+    urls = ("/api/tickets", f"/api/tickets/{ticket_id}", f"/api/tickets/{ticket_id}/comments")
+
+    async def etags() -> dict:
+        return {url: (await api.get(url, headers=employee.headers)).headers["etag"] for url in urls}
+
+    changes = (
+        lambda: api.post(f"/api/tickets/{ticket_id}/comments", headers=technician.headers,
+                         json={"text": "Sedang dicek dari sisi server"}),
+        lambda: api.post(f"/api/tickets/{ticket_id}/accept", headers=technician.headers),
+        lambda: api.post(f"/api/tickets/{ticket_id}/complete", headers=technician.headers,
+                         json={"resolution_notes": "Sertifikat VPN diperbarui"}),
+    )
+    before = await etags()
+    for change in changes:
+        assert (await change()).status_code in (200, 201)
+        for url, etag in before.items():
+            response = await _revalidate(api, employee, url, etag)
+            assert response.status_code == 200, url
+            assert response.headers["etag"] != etag
+        before = await etags()
@@ -0,0 +1,27 @@
+"""
+Server-Sent Events subscriptions
+"""
+import pytest
+from starlette.requests import Request
+from src.models import UserRole
+from src.routes.events import event_stream
+from src.services.events import event_hub
+
+
+@pytest.mark.asyncio
+async def test_stream_subscribes_only_while_the_body_runs(schema, make_user):
+    user = make_user(UserRole.EMPLOYEE)
+    token = user.headers["Authorization"].removeprefix("Bearer ")
+    request = Request({"type": "http", "method": "GET", "path": "/api/events", "headers": []})
+
+    # A response whose body never starts (client gone before the headers) leaves nothing behind
+    await event_stream(request, token=token, credentials=None)
+    assert user.id not in event_hub._subscribers
+
+    response = await event_stream(request, token=token, credentials=None)
+    body = response.body_iterator
+    assert await anext(body) == "retry: 3000\n\n"
+    assert user.id in event_hub._subscribers
+
+    await body.aclose()
+    assert user.id not in event_hub._subscribers
@@ -0,0 +1,59 @@
+"""
+Materialized unread notification counters
+"""
+import pytest
+from sqlalchemy import func, select
+from src.database import SessionLocal
+from src.models import Notification, UserRole
+
+
+def _unread_rows(user_id: str) -> int:
+    with SessionLocal() as db:
+        return db.scalar(
+            select(func.count()).where(Notification.user_id == user_id, Notification.read_status == False)
+        )
+
+
+async def _unread_count(api, user) -> int:
+    count = (await api.get("/api/notifications/unread-count", headers=user.headers)).json()["unread_count"]
+    assert count == _unread_rows(user.id)
+    return count
+
+
+@pytest.mark.asyncio
+async def test_unread_count_follows_reads(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("akun",))
+    ticket_id = (await api.post("/api/tickets", headers=employee.headers, json={
+        "deskripsi": "Akun email terkunci", "kategori": "akun", "technician_id": technician.id
+    })).json()["id"]
+    for text in ("Sudah dicoba reset", "Masih belum bisa masuk"):
+        await api.post(f"/api/tickets/{ticket_id}/comments", headers=employee.headers, json={"text": text})
+
+    # One assignment and two comments
+    assert await _unread_count(api, technician) == 3
+    inbox = (await api.get("/api/notifications", headers=technician.headers)).json()
+    assert inbox["unread_count"] == 3
+    notification_id = inbox["notifications"][0]["id"]
+
+    read = await api.post(f"/api/notifications/{notification_id}/read", headers=technician.headers)
+    assert read.json()["unread_count"] == 2
+    # Reading it again is a no-op, and nobody else can read it
+    again = await api.post(f"/api/notifications/{notification_id}/read", headers=technician.headers)
+    assert again.json()["unread_count"] == 2
+    assert (await api.post(f"/api/notifications/{notification_id}/read", headers=employee.headers)).status_code == 404
+    assert await _unread_count(api, technician) == 2
+
+    unread = (await api.get("/api/notifications", headers=technician.headers, params={"unread_only": True})).json()
+    assert len(unread["notifications"]) == 2
+
+    read_all = await api.post("/api/notifications/read-all", headers=technician.headers)
+    assert read_all.json()["unread_count"] == 0
+    assert (await api.post("/api/notifications/read-all", headers=technician.headers)).json()["unread_count"] == 0
+    assert await _unread_count(api, technician) == 0
+
+    # New notifications count from zero again
+    await api.post(f"/api/tickets/{ticket_id}/accept", headers=technician.headers)
+    assert await _unread_count(api, employee) == 1
+    await api.post(f"/api/tickets/{ticket_id}/comments", headers=employee.headers, json={"text": "Terima kasih"})
+    assert await _unread_count(api, technician) == 1
@@ -0,0 +1,163 @@
+"""
+Read-replica routing: replica reads, read-your-writes and failover
+
+Two SQLite files stand in for the primary and a replica; each holds a
+`marker` row naming itself, so a read shows which database served it.
+"""
+import asyncio
+import sqlite3
+import time
+import httpx
+import pytest
+from sqlalchemy import Column, MetaData, String, Table, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.config import get_settings
+from src.database import AsyncSessionLocal, Replica, ReplicaRouter, client_last_write, replica_router
+from src.middleware.auth import get_user_read_db
+from src.middleware.read_your_writes import ReadYourWritesMiddleware, encode_last_write
+from src.middleware.request_log import RequestLogMiddleware
+from src.models import UserRole
+from src.services.principals import Principal
+from src.utils.log import bind_request, current_request, reset_request
+
+marker = Table("marker", MetaData(), Column("source", String))
+
+STICKY_SECONDS = 0.3
+RETRY_SECONDS = 0.3
+
+
+def _create_marker_db(path: str, source: str) -> None:
+    with sqlite3.connect(path) as connection:
+        connection.execute("DROP TABLE IF EXISTS marker")
+        connection.execute("CREATE TABLE marker (source TEXT)")
+        connection.execute("INSERT INTO marker VALUES (?)", (source,))
+
+
+def _principal(user_id: str) -> Principal:
+    return Principal(id=user_id, role=UserRole.EMPLOYEE, nama=user_id, nip=None, region=None, is_active=True)
+
+
+async def _read_source(principal: Principal, last_write=None) -> str:
+    """Open a session through the read-only route dependency and report which database answered"""
+    token = bind_request("test-read")
+    current_request().last_write = last_write
+    sessions = get_user_read_db(principal)
+    try:
+        db = await anext(sessions)
+        return await db.scalar(select(marker.c.source).limit(1))
+    finally:
+        await sessions.aclose()
+        reset_request(token)
+
+
+def _worker(router: ReplicaRouter) -> httpx.AsyncClient:
+    """
+    One API worker with its own router: POST commits a write on the
+    primary, GET answers with the database its read session used
+    """
+    async def app(scope, receive, send):
+        if scope["method"] == "POST":
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(marker).values(source="primary"))
+                await db.commit()
+            body = b""
+        else:
+            db = await router.session(client_last_write())
+            async with db:
+                body = (await db.scalar(select(marker.c.source).limit(1))).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    transport = httpx.ASGITransport(app=RequestLogMiddleware(ReadYourWritesMiddleware(app)))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def _replica(name: str, path: str) -> Replica:
+    return Replica(name=name, engine=create_async_engine(f"sqlite+aiosqlite:///{path}"))
+
+
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    """Route reads to a real replica file plus one that cannot be opened"""
+    primary_path = get_settings().database_url.removeprefix("sqlite:///")
+    _create_marker_db(primary_path, "primary")
+    _create_marker_db(str(tmp_path / "replica.db"), "replica")
+
+    down = _replica("down", str(tmp_path / "missing" / "replica.db"))
+    up = _replica("up", str(tmp_path / "replica.db"))
+    monkeypatch.setattr(replica_router, "sticky_seconds", STICKY_SECONDS)
+    monkeypatch.setattr(replica_router, "retry_seconds", RETRY_SECONDS)
+    monkeypatch.setattr(replica_router, "_next", 0)
+    monkeypatch.setattr(replica_router, "replicas", [up])
+    return {"up": up, "down": down}
+
+
+@pytest.mark.asyncio
+async def test_read_only_dependency_uses_the_replica(replicas):
+    assert await _read_source(_principal("alice")) == "replica"
+
+    # A client that just wrote reads its write back from the primary
+    assert await _read_source(_principal("alice"), last_write=time.time()) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_sticky_window_follows_the_client_across_workers(replicas):
+    # Separate routers, as in separate worker processes: neither sees the other's writes
+    first = _worker(ReplicaRouter([replicas["up"]], STICKY_SECONDS, RETRY_SECONDS))
+    second = _worker(ReplicaRouter([replicas["up"]], STICKY_SECONDS, RETRY_SECONDS))
+    async with first, second:
+        written = await first.post("/write")
+        last_write = written.headers["x-last-write"]
+        assert written.cookies["last_write"] == last_write
+
+        # The next request lands on the other worker; the client carries its write time
+        assert (await second.get("/read", headers={"X-Last-Write": last_write})).text == "primary"
+        second.cookies = written.cookies
+        assert (await second.get("/read")).text == "primary"
+        second.cookies.clear()
+        # Other clients, and reads that do not write, stay on the replica
+        assert (await second.get("/read")).text == "replica"
+        assert "x-last-write" not in (await second.get("/read")).headers
+
+        await asyncio.sleep(STICKY_SECONDS + 0.1)
+        assert (await second.get("/read", headers={"X-Last-Write": last_write})).text == "replica"
+
+
+@pytest.mark.asyncio
+async def test_forged_write_time_is_ignored(replicas):
+    future = encode_last_write(time.time() + 3600)
+    forged = f"{int(time.time() * 1000)}.{'0' * 32}"
+    async with _worker(replica_router) as worker:
+        for value in (future, forged, "garbage"):
+            assert (await worker.get("/read", headers={"X-Last-Write": value})).text == "replica"
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_is_skipped_until_retry(replicas, monkeypatch):
+    down, up = replicas["down"], replicas["up"]
+    monkeypatch.setattr(replica_router, "replicas", [down, up])
+
+    # The first pick is the unreachable replica; its reads fail over to the next one
+    assert await _read_source(_principal("alice")) == "replica"
+    assert not down.is_up()
+    failed_at = down.down_until
+
+    # While it is down it is not tried again, so every read goes straight to `up`
+    for _ in range(3):
+        assert await _read_source(_principal("alice")) == "replica"
+    assert down.down_until == failed_at
+
+    # After the retry interval it is tried (and fails) once more
+    await asyncio.sleep(RETRY_SECONDS + 0.1)
+    assert down.is_up()
+    monkeypatch.setattr(replica_router, "_next", 0)
+    assert await _read_source(_principal("alice")) == "replica"
+    assert down.down_until > failed_at
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_primary_without_healthy_replicas(replicas, monkeypatch):
+    monkeypatch.setattr(replica_router, "replicas", [replicas["down"]])
+
+    assert await _read_source(_principal("alice")) == "primary"
+    assert time.monotonic() < replicas["down"].down_until
@@ -0,0 +1,79 @@
+"""
+Keyset cursor pagination of the ticket list
+
+Tickets are inserted directly with controlled created_at values, several
+sharing a timestamp, so pages cut through ties that only the id
+tie-breaker orders.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.database import SessionLocal
+from src.models import Ticket, TicketCategory, TicketStatus, UserRole
+
+START = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)
+
+
+def _insert_tickets(employee_id: str, created_at: list[datetime]) -> list[str]:
+    tickets = [
+        Ticket(
+            id=str(uuid.uuid4()),
+            employee_id=employee_id,
+            deskripsi=f"Tiket uji nomor {n}",
+            kategori=TicketCategory.APLIKASI,
+            status=TicketStatus.PENDING,
+            created_at=at,
+            updated_at=at
+        )
+        for n, at in enumerate(created_at)
+    ]
+    ids = [ticket.id for ticket in tickets]
+    with SessionLocal() as db:
+        db.add_all(tickets)
+        db.commit()
+    return ids
+
+
+async def _walk(api, user, limit: int, between_pages=None) -> list[str]:
+    """Follow next_cursor from the first page to the last, returning ids in order"""
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        body = (await api.get("/api/tickets", headers=user.headers, params=params)).json()
+        ids += [ticket["id"] for ticket in body["tickets"]]
+        cursor = body["next_cursor"]
+        pages += 1
+        if cursor is None:
+            return ids
+        if between_pages is not None:
+            between_pages(pages)
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_ticket_once(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    # Groups of three tickets share a timestamp
+    created_at = [START + timedelta(minutes=n // 3) for n in range(23)]
+    _insert_tickets(employee.id, created_at)
+
+    full = (await api.get("/api/tickets", headers=employee.headers, params={"limit": 100})).json()
+    expected = [ticket["id"] for ticket in full["tickets"]]
+    assert full["total"] == 23
+
+    for limit in (1, 3, 4, 7, 23, 50):
+        assert await _walk(api, employee, limit) == expected
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_are_stable_under_concurrent_inserts(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    _insert_tickets(employee.id, [START + timedelta(minutes=n // 2) for n in range(12)])
+    expected = await _walk(api, employee, 100)
+
+    # New tickets arrive at the head of the list while a client is paging;
+    # an OFFSET page would shift and repeat rows, a keyset page does not
+    newer = START + timedelta(days=1)
+    seen = await _walk(api, employee, 5, lambda page: _insert_tickets(employee.id, [newer] * 3))
+
+    assert seen == expected
+    assert len(set(seen)) == len(seen)
@@ -0,0 +1,71 @@
+"""
+Accept and complete under concurrency
+
+Each transition is one conditional UPDATE, so of several identical
+requests racing on the same ticket exactly one wins; the others get 400
+and must not touch the technician's counters.
+"""
+import asyncio
+import pytest
+from src.database import SessionLocal
+from src.models import User, UserRole
+
+RACERS = 6
+
+
+def _counters(user_id: str) -> tuple:
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        return user.assigned_tickets_count, user.completed_tickets_count
+
+
+@pytest.mark.asyncio
+async def test_concurrent_accept_and_complete_succeed_once(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("hardware",))
+    created = await api.post("/api/tickets", headers=employee.headers, json={
+        "deskripsi": "Laptop tidak mau menyala", "kategori": "hardware", "technician_id": technician.id
+    })
+    ticket_id = created.json()["id"]
+    assert _counters(technician.id) == (1, 0)
+
+    accepts = await asyncio.gather(*[
+        api.post(f"/api/tickets/{ticket_id}/accept", headers=technician.headers) for _ in range(RACERS)
+    ])
+    assert sorted(response.status_code for response in accepts) == [200] + [400] * (RACERS - 1)
+    accepted = next(response.json() for response in accepts if response.status_code == 200)
+    assert accepted["status"] == "in_progress"
+    assert accepted["technician_nama"] is not None
+    assert _counters(technician.id) == (1, 0)
+
+    completes = await asyncio.gather(*[
+        api.post(
+            f"/api/tickets/{ticket_id}/complete", headers=technician.headers,
+            json={"resolution_notes": "Adaptor daya sudah diganti"}
+        )
+        for _ in range(RACERS)
+    ])
+    assert sorted(response.status_code for response in completes) == [200] + [400] * (RACERS - 1)
+    assert _counters(technician.id) == (0, 1)
+
+    # The responses match what a fresh read returns
+    completed = next(response.json() for response in completes if response.status_code == 200)
+    fetched = (await api.get(f"/api/tickets/{ticket_id}", headers=technician.headers)).json()
+    assert completed == fetched
+
+
+@pytest.mark.asyncio
+async def test_transition_errors_leave_counters_alone(api, make_user):
+    employee = make_user(UserRole.EMPLOYEE)
+    technician = make_user(UserRole.TECHNICIAN, categories=("zoom",))
+    other = make_user(UserRole.TECHNICIAN, categories=("zoom",))
+    ticket_id = (await api.post("/api/tickets", headers=employee.headers, json={
+        "deskripsi": "Zoom tidak bisa berbagi layar", "kategori": "zoom", "technician_id": technician.id
+    })).json()["id"]
+
+    notes = {"resolution_notes": "Izin berbagi layar diaktifkan"}
+    assert (await api.post(f"/api/tickets/{ticket_id}/complete", headers=technician.headers, json=notes)).status_code == 400
+    assert (await api.post(f"/api/tickets/{ticket_id}/accept", headers=other.headers)).status_code == 403
+    assert (await api.post("/api/tickets/missing/accept", headers=technician.headers)).status_code == 404
+    assert _counters(technician.id) == (1, 0)
+    assert _counters(other.id) == (0, 0)